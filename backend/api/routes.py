@@ -1,22 +1,63 @@
 """API routes for the F1 Race Replay application."""
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+from typing import List, Dict, Any, Optional, Tuple
 import logging
+import threading
 
-from backend.data.loader import F1DataLoader
-from backend.data.processor import RaceDataProcessor
+import numpy as np
+
+from backend.data.comparison import LapTraceCache, resample_lap, compare_traces
+from backend.data.events import EventIndex
+from backend.data.store import ProcessedRaceStore
+from backend.utils.constants import WARM_RACES
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api")
 
-# Global data loader instance
-data_loader = F1DataLoader()
+# Global data loader instance, built on first use so that importing this
+# module does not pull in fastf1/pandas/scipy
+_data_loader = None
+_data_loader_lock = threading.Lock()
+
+# Processed races shared by all worker processes (memory-mapped files)
+race_store = ProcessedRaceStore()
 
-# Cache for processed race data
+# Per-process cache of memory-mapped race data
 race_data_cache = {}
 
+# Event indexes for races in race_data_cache
+event_index_cache = {}
+
+# Resampled lap traces for driver comparisons
+lap_trace_cache = LapTraceCache()
+
+
+def get_data_loader():
+    """Get the global F1DataLoader, creating it on first use."""
+    global _data_loader
+    if _data_loader is None:
+        with _data_loader_lock:
+            if _data_loader is None:
+                from backend.data.loader import F1DataLoader
+                _data_loader = F1DataLoader()
+    return _data_loader
+
+
+def _to_json(value: Any) -> Any:
+    """Convert numpy arrays and scalars in race data to JSON-safe types."""
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
 
 @router.get("/races/{year}")
 async def get_races(year: int) -> List[Dict[str, Any]]:
@@ -30,7 +71,7 @@ async def get_races(year: int) -> List[Dict[str, Any]]:
         List of race information
     """
     try:
-        races = data_loader.get_available_races(year)
+        races = get_data_loader().get_available_races(year)
         return races
     except Exception as e:
         logger.error(f"Error getting races: {e}")
@@ -38,7 +79,7 @@ async def get_races(year: int) -> List[Dict[str, Any]]:
 
 
 @router.get("/session/{year}/{gp}/{session_type}")
-async def get_session_info(year: int, gp: str, session_type: str = "R") -> Dict[str, Any]:
+def get_session_info(year: int, gp: str, session_type: str = "R") -> Dict[str, Any]:
     """
     Get session information without loading full telemetry.
     
@@ -51,16 +92,13 @@ async def get_session_info(year: int, gp: str, session_type: str = "R") -> Dict[
         Session information
     """
     try:
-        session = data_loader.load_session(year, gp, session_type)
-        if not session:
+        metadata = get_data_loader().get_session_metadata(year, gp, session_type)
+        if not metadata:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        session_info = data_loader.get_session_info(session)
-        drivers_info = data_loader.get_drivers_info(session)
-        
         return {
-            'session': session_info,
-            'drivers': drivers_info,
+            'session': metadata['session'],
+            'drivers': metadata['drivers_info'],
         }
     except HTTPException:
         raise
@@ -69,10 +107,9 @@ async def get_session_info(year: int, gp: str, session_type: str = "R") -> Dict[
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/race-data/{year}/{gp}/{session_type}")
-async def get_race_data(year: int, gp: str, session_type: str = "R") -> Dict[str, Any]:
+def load_race_data(year: int, gp: str, session_type: str = "R") -> Dict[str, Any]:
     """
-    Load and process complete race data for replay.
+    Get processed race data from the cache, building it if needed.
     
     Args:
         year: Year of the race
@@ -80,7 +117,7 @@ async def get_race_data(year: int, gp: str, session_type: str = "R") -> Dict[str
         session_type: Session type
     
     Returns:
-        Processed race data with timeline and driver telemetry
+        Processed race data with numpy (memory-mapped) arrays
     """
     cache_key = f"{year}_{gp}_{session_type}"
     
@@ -89,28 +126,38 @@ async def get_race_data(year: int, gp: str, session_type: str = "R") -> Dict[str
         logger.info(f"Returning cached data for {cache_key}")
         return race_data_cache[cache_key]
     
-    try:
+    def build() -> Optional[Dict[str, Any]]:
+        data_loader = get_data_loader()
+        
         # Load session
         session = data_loader.load_session(year, gp, session_type)
         if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
+            return None
         
         # Get session info
-        session_info = data_loader.get_session_info(session)
-        drivers_info = data_loader.get_drivers_info(session)
-        track_data = data_loader.get_track_data(session)
+        metadata = data_loader.get_session_metadata(year, gp, session_type)
         
         # Process race data
+        from backend.data.processor import RaceDataProcessor
         processor = RaceDataProcessor(session)
         race_data = processor.process_race_data()
         
+        # Processed arrays replace the raw telemetry from here on
+        data_loader.release_session(year, gp, session_type)
+        
         # Combine all data
-        result = {
-            'session': session_info,
-            'drivers_info': drivers_info,
-            'track': track_data,
+        return {
+            'session': metadata['session'],
+            'drivers_info': metadata['drivers_info'],
+            'track': metadata['track'],
             'race_data': race_data,
         }
+    
+    try:
+        # Only one worker builds a race; the rest map the stored files
+        result = race_store.get_or_build(cache_key, build)
+        if not result:
+            raise HTTPException(status_code=404, detail="Session not found")
         
         # Cache the result
         race_data_cache[cache_key] = result
@@ -124,8 +171,24 @@ async def get_race_data(year: int, gp: str, session_type: str = "R") -> Dict[str
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/race-data/{year}/{gp}/{session_type}")
+def get_race_data(year: int, gp: str, session_type: str = "R") -> Dict[str, Any]:
+    """
+    Load and process complete race data for replay.
+    
+    Args:
+        year: Year of the race
+        gp: Grand Prix name or round number
+        session_type: Session type
+    
+    Returns:
+        Processed race data with timeline and driver telemetry
+    """
+    return _to_json(load_race_data(year, gp, session_type))
+
+
 @router.get("/track/{year}/{gp}")
-async def get_track_layout(year: int, gp: str) -> Dict[str, Any]:
+def get_track_layout(year: int, gp: str) -> Dict[str, Any]:
     """
     Get track layout data.
     
@@ -137,11 +200,11 @@ async def get_track_layout(year: int, gp: str) -> Dict[str, Any]:
         Track coordinates and information
     """
     try:
-        session = data_loader.load_session(year, gp, "R")
-        if not session:
+        metadata = get_data_loader().get_session_metadata(year, gp, "R")
+        if not metadata:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        track_data = data_loader.get_track_data(session)
+        track_data = metadata['track']
         if not track_data:
             raise HTTPException(status_code=404, detail="Track data not available")
         
@@ -154,7 +217,189 @@ async def get_track_layout(year: int, gp: str) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/events/{year}/{gp}/{session_type}")
+def get_race_events(
+    year: int,
+    gp: str,
+    session_type: str = "R",
+    types: Optional[List[str]] = Query(None, description="Event types to include"),
+    drivers: Optional[List[str]] = Query(None, description="Driver numbers involved"),
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get race events, optionally filtered, for jump-to-event seeking.
+    
+    Args:
+        year: Year of the race
+        gp: Grand Prix name or round number
+        session_type: Session type
+        types: Event types (overtake, pit_entry, pit_exit, drs_activation, retirement)
+        drivers: Driver numbers involved in the event
+        start_time: Earliest event time in seconds
+        end_time: Latest event time in seconds
+    
+    Returns:
+        Matching events sorted by frame; each frame can be passed to the
+        replay WebSocket as a seek target
+    """
+    cache_key = f"{year}_{gp}_{session_type}"
+    
+    if cache_key not in event_index_cache:
+        race_data = load_race_data(year, gp, session_type)['race_data']
+        event_index_cache[cache_key] = EventIndex(race_data.get('events', []))
+    
+    return event_index_cache[cache_key].filter(types, drivers, start_time, end_time)
+
+
+@router.get("/compare/{year}/{gp}/{session_type}")
+def compare_laps(
+    year: int,
+    gp: str,
+    session_type: str = "R",
+    laps: List[str] = Query(..., description="Driver/lap pairs as DRIVER:LAP, reference first")
+) -> Dict[str, Any]:
+    """
+    Compare laps on a common distance grid.
+    
+    Args:
+        year: Year of the race
+        gp: Grand Prix name or round number
+        session_type: Session type
+        laps: Driver/lap pairs such as "44:12"; the first is the reference
+    
+    Returns:
+        Distance grid plus speed/throttle/brake/gear traces and a delta-time
+        curve against the reference for every requested lap
+    """
+    try:
+        pairs = []
+        for item in laps:
+            driver, lap_number = item.split(':')
+            pairs.append((driver.upper(), int(lap_number)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Laps must be given as DRIVER:LAP")
+    
+    session_key = f"{year}_{gp}_{session_type}"
+    
+    try:
+        processor = None
+        traces = []
+        
+        for driver, lap_number in pairs:
+            trace_key = (session_key, driver, lap_number)
+            trace = lap_trace_cache.get(trace_key)
+            
+            if trace is None:
+                # Only load the session when a trace isn't cached yet
+                if processor is None:
+                    session = get_data_loader().load_session(year, gp, session_type)
+                    if not session:
+                        raise HTTPException(status_code=404, detail="Session not found")
+                    from backend.data.processor import RaceDataProcessor
+                    processor = RaceDataProcessor(session)
+                
+                telemetry = processor.get_lap_telemetry(driver, lap_number)
+                if telemetry is None:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"No telemetry for driver {driver} lap {lap_number}"
+                    )
+                
+                trace = resample_lap(telemetry)
+                lap_trace_cache.put(trace_key, trace)
+            
+            traces.append(trace)
+        
+        comparison = compare_traces(traces)
+        for (driver, lap_number), trace in zip(pairs, comparison['traces']):
+            trace['driver'] = driver
+            trace['lap'] = lap_number
+        
+        return _to_json(comparison)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error comparing laps: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def parse_warm_races(spec: str) -> List[Tuple[int, str, str]]:
+    """
+    Parse a warm race list such as "2024:Monaco:R,2024:Silverstone:R".
+    
+    Args:
+        spec: Comma-separated YEAR:GP[:SESSION] entries
+    
+    Returns:
+        List of (year, gp, session_type) tuples
+    """
+    races = []
+    for entry in filter(None, (e.strip() for e in spec.split(','))):
+        parts = entry.split(':')
+        try:
+            races.append((int(parts[0]), parts[1], parts[2] if len(parts) > 2 else "R"))
+        except (ValueError, IndexError):
+            logger.error(f"Ignoring invalid warm race entry: {entry}")
+    return races
+
+
+# Progress of the startup preload; ready once every warm race is loaded
+warm_status = {
+    'ready': True,
+    'pending': [],
+    'loaded': [],
+    'failed': [],
+}
+
+
+def _preload_races(races: List[Tuple[int, str, str]]):
+    """Load each race into the processed-race cache, then mark ready."""
+    for year, gp, session_type in races:
+        key = f"{year}_{gp}_{session_type}"
+        try:
+            load_race_data(year, gp, session_type)
+            warm_status['loaded'].append(key)
+            logger.info(f"Preloaded {key}")
+        except Exception as e:
+            warm_status['failed'].append(key)
+            logger.error(f"Error preloading {key}: {e}")
+        finally:
+            warm_status['pending'].remove(key)
+    
+    warm_status['ready'] = True
+    logger.info("Warm races loaded, ready for traffic")
+
+
+def start_preload(spec: str = WARM_RACES):
+    """
+    Preload hot races in a background thread.
+    
+    Readiness (/api/ready) stays false until the preload finishes;
+    liveness (/api/health) is unaffected.
+    
+    Args:
+        spec: Warm race list, see parse_warm_races
+    """
+    races = parse_warm_races(spec)
+    if not races:
+        return
+    
+    warm_status['ready'] = False
+    warm_status['pending'] = [f"{year}_{gp}_{st}" for year, gp, st in races]
+    threading.Thread(target=_preload_races, args=(races,), daemon=True).start()
+
+
 @router.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness check endpoint."""
     return {"status": "healthy", "service": "F1 Race Replay API"}
+
+
+@router.get("/ready")
+async def readiness_check():
+    """Readiness check endpoint; 503 until the warm races are loaded."""
+    if not warm_status['ready']:
+        return JSONResponse(status_code=503, content={"status": "warming", **warm_status})
+    return {"status": "ready", **warm_status}
@@ -4,10 +4,142 @@ from fastapi import WebSocket, WebSocketDisconnect
 import asyncio
 import json
 import logging
-from typing import Dict, Any
+import math
+import re
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Set, Union
+
+from backend.data.ingest import FeedTailer, LiveRace
+
+from backend.utils.constants import (
+    TELEMETRY_FREQUENCY,
+    TELEMETRY_CHANNELS,
+    INTEGER_CHANNELS,
+    FRAME_ENCODINGS,
+    WS_MIN_FPS,
+    WS_SEND_BUDGET,
+    WS_SEND_SMOOTHING,
+    LIVE_FEED_DIR,
+    INGEST_POLL_INTERVAL,
+)
 
 logger = logging.getLogger(__name__)
 
+# Binary frame layout (little endian): frame index, time, driver count,
+# then one fixed-size record per driver. Missing channels are NaN / -1.
+FRAME_HEADER = struct.Struct('<IdH')
+DRIVER_RECORD = struct.Struct('<Hfffbbbhbb')
+
+
+def default_subscription() -> Dict[str, Any]:
+    """Subscription used until a client asks for something narrower."""
+    return {
+        'drivers': None,  # None means every driver
+        'channels': set(TELEMETRY_CHANNELS),
+        'detail_drivers': set(),
+        'encoding': 'json',
+    }
+
+
+def build_frame(
+    frame_idx: int,
+    timeline,
+    drivers: Dict[str, Any],
+    subscription: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build a single replay frame restricted to a client's subscription.
+    
+    Args:
+        frame_idx: Index in the timeline
+        timeline: Timeline array in seconds
+        drivers: Processed driver data keyed by driver number
+        subscription: Client subscription (drivers, channels, detail_drivers)
+    
+    Returns:
+        Frame message ready to be sent to the client
+    """
+    frame_data = {
+        'type': 'frame',
+        'frame_index': frame_idx,
+        'time': float(timeline[frame_idx]),
+        'drivers': {}
+    }
+    
+    wanted_drivers = subscription['drivers']
+    channels = subscription['channels']
+    detail_drivers = subscription['detail_drivers']
+    
+    for driver_num, driver_data in drivers.items():
+        if wanted_drivers is not None and driver_num not in wanted_drivers:
+            continue
+        
+        telemetry = driver_data['telemetry']
+        if frame_idx >= len(telemetry['time']):
+            continue
+        
+        driver_frame = {
+            'abbreviation': driver_data['abbreviation'],
+            'team': driver_data['team'],
+            'team_color': driver_data['team_color'],
+        }
+        
+        driver_channels = TELEMETRY_CHANNELS if driver_num in detail_drivers else channels
+        for channel in TELEMETRY_CHANNELS:
+            if channel not in driver_channels or channel not in telemetry:
+                continue
+            value = telemetry[channel][frame_idx]
+            if channel in INTEGER_CHANNELS:
+                driver_frame[channel] = int(value)
+            elif not math.isnan(value):
+                driver_frame[channel] = float(value)
+        
+        frame_data['drivers'][driver_num] = driver_frame
+    
+    return frame_data
+
+
+def _fit(value: int, bits: int) -> int:
+    """A signed integer field's value, or -1 (unknown) if it does not fit."""
+    limit = 1 << (bits - 1)
+    return value if -limit <= value < limit else -1
+
+
+def encode_frame_binary(frame_data: Dict[str, Any]) -> bytes:
+    """
+    Pack a frame built by build_frame into the compact binary layout.
+    
+    Driver metadata is not included; clients look it up from the
+    session's driver info. Integer values that do not fit their field are
+    sent as -1 (unknown).
+    
+    Args:
+        frame_data: Frame message from build_frame
+    
+    Returns:
+        Encoded frame bytes
+    """
+    drivers = frame_data['drivers']
+    parts = [FRAME_HEADER.pack(frame_data['frame_index'], frame_data['time'], len(drivers))]
+    
+    for driver_num, driver_frame in drivers.items():
+        parts.append(DRIVER_RECORD.pack(
+            int(driver_num),
+            driver_frame.get('x', math.nan),
+            driver_frame.get('y', math.nan),
+            driver_frame.get('speed', math.nan),
+            _fit(driver_frame.get('gear', -1), 8),
+            _fit(driver_frame.get('drs', -1), 8),
+            _fit(driver_frame.get('compound', -1), 8),
+            _fit(driver_frame.get('tyre_age', -1), 16),
+            _fit(driver_frame.get('in_pit', -1), 8),
+            _fit(driver_frame.get('position', -1), 8),
+        ))
+    
+    return b''.join(parts)
+
 
 class ReplayManager:
     """Manages race replay streaming via WebSocket."""
@@ -15,11 +147,20 @@ class ReplayManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.replay_tasks: Dict[str, asyncio.Task] = {}
+        self.subscriptions: Dict[str, Dict[str, Any]] = {}
+        self.send_stats: Dict[str, Dict[str, float]] = {}
+        self.seek_requests: Dict[str, int] = {}
+        self.live_followers: Dict[str, Set[str]] = {}
+        self.live_tasks: Dict[str, asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket, client_id: str):
         """Accept a new WebSocket connection."""
         await websocket.accept()
         self.active_connections[client_id] = websocket
+        self.subscriptions[client_id] = default_subscription()
+        self.send_stats[client_id] = {
+            'send_time': 0.0,
+        }
         logger.info(f"Client {client_id} connected")
     
     def disconnect(self, client_id: str):
@@ -29,16 +170,294 @@ class ReplayManager:
         if client_id in self.replay_tasks:
             self.replay_tasks[client_id].cancel()
             del self.replay_tasks[client_id]
+        self.subscriptions.pop(client_id, None)
+        self.send_stats.pop(client_id, None)
+        self.seek_requests.pop(client_id, None)
+        self.unfollow_live(client_id)
         logger.info(f"Client {client_id} disconnected")
     
+    def update_subscription(self, client_id: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Change which drivers and channels a client receives.
+        
+        Takes effect on the next frame of a running replay. Only the fields
+        present in changes are updated, the rest of the subscription is
+        kept; a field explicitly set to None resets to its default (all
+        drivers, all channels, no detail drivers). Unknown channel names
+        and encodings are ignored.
+        
+        Args:
+            client_id: Client identifier
+            changes: Any of drivers, channels, detail_drivers and encoding
+        
+        Returns:
+            The client's new subscription
+        """
+        defaults = default_subscription()
+        subscription = dict(self.subscriptions.get(client_id) or defaults)
+        
+        if 'drivers' in changes:
+            drivers = changes['drivers']
+            subscription['drivers'] = {str(d) for d in drivers} if drivers is not None else None
+        if 'channels' in changes:
+            channels = changes['channels']
+            subscription['channels'] = (
+                {c for c in channels if c in TELEMETRY_CHANNELS}
+                if channels is not None else defaults['channels']
+            )
+        if 'detail_drivers' in changes:
+            detail_drivers = changes['detail_drivers']
+            subscription['detail_drivers'] = (
+                {str(d) for d in detail_drivers}
+                if detail_drivers is not None else defaults['detail_drivers']
+            )
+        if 'encoding' in changes:
+            encoding = changes['encoding']
+            if encoding is None:
+                subscription['encoding'] = defaults['encoding']
+            elif encoding in FRAME_ENCODINGS:
+                subscription['encoding'] = encoding
+        
+        self.subscriptions[client_id] = subscription
+        return subscription
+    
+    def seek(self, client_id: str, frame_index: int):
+        """Jump a running replay to a frame, e.g. a race event's frame."""
+        self.seek_requests[client_id] = frame_index
+    
+    def _record_send(self, client_id: str, elapsed: float):
+        """Fold one send duration into the client's smoothed send time."""
+        stats = self.send_stats.get(client_id)
+        if stats is None:
+            return
+        
+        alpha = WS_SEND_SMOOTHING
+        stats['send_time'] = (1 - alpha) * stats['send_time'] + alpha * elapsed
+    
+    def _adapt_stride(
+        self,
+        client_id: str,
+        stride: int,
+        frame_interval: float,
+        lateness: float
+    ) -> int:
+        """
+        Pick how many timeline frames to advance per sent frame.
+        
+        The stride grows when sends take more than WS_SEND_BUDGET of the
+        time available per sent frame or the stream has fallen behind
+        schedule, and shrinks again once the client has headroom.
+        
+        Args:
+            client_id: Client identifier
+            stride: Current stride
+            frame_interval: Wall-clock seconds between timeline frames
+            lateness: Seconds the stream is behind its schedule
+        
+        Returns:
+            New stride
+        """
+        stats = self.send_stats.get(client_id)
+        if stats is None:
+            return stride
+        
+        max_stride = max(1, int(1.0 / (WS_MIN_FPS * frame_interval)))
+        send_time = stats['send_time']
+        
+        if stride < max_stride and (
+            send_time > WS_SEND_BUDGET * frame_interval * stride
+            or lateness > frame_interval * stride
+        ):
+            return stride + 1
+        
+        if stride > 1 and lateness < 0.5 * frame_interval and (
+            send_time < 0.5 * WS_SEND_BUDGET * frame_interval * (stride - 1)
+        ):
+            return stride - 1
+        
+        return stride
+    
     async def send_message(self, client_id: str, message: Dict[str, Any]):
         """Send a message to a specific client."""
+        await self.send_text(client_id, json.dumps(message))
+    
+    async def send_text(self, client_id: str, text: str):
+        """Send an already serialized text message to a specific client."""
         if client_id in self.active_connections:
             try:
-                await self.active_connections[client_id].send_json(message)
+                start = time.perf_counter()
+                await self.active_connections[client_id].send_text(text)
+                self._record_send(client_id, time.perf_counter() - start)
             except Exception as e:
                 logger.error(f"Error sending message to {client_id}: {e}")
     
+    async def send_bytes(self, client_id: str, data: bytes):
+        """Send a binary message to a specific client."""
+        if client_id in self.active_connections:
+            try:
+                start = time.perf_counter()
+                await self.active_connections[client_id].send_bytes(data)
+                self._record_send(client_id, time.perf_counter() - start)
+            except Exception as e:
+                logger.error(f"Error sending message to {client_id}: {e}")
+    
+    async def send_frame(self, client_id: str, frame_data: Dict[str, Any], subscription: Dict[str, Any]):
+        """Send a frame in the client's subscribed encoding."""
+        if subscription['encoding'] == 'binary':
+            await self.send_bytes(client_id, encode_frame_binary(frame_data))
+        else:
+            await self.send_message(client_id, frame_data)
+    
+    def follow_live(self, client_id: str, feed: str) -> bool:
+        """
+        Start pushing frames from a live feed to a client.
+        
+        The feed is ingested once, however many clients follow it.
+        
+        Args:
+            client_id: Client identifier
+            feed: Feed name, read from LIVE_FEED_DIR/<feed>.jsonl
+        
+        Returns:
+            True if the feed exists and the client now follows it
+        """
+        if not re.fullmatch(r'[\w-]+', feed or ''):
+            return False
+        path = Path(LIVE_FEED_DIR) / f"{feed}.jsonl"
+        if not path.exists():
+            return False
+        
+        self.unfollow_live(client_id)
+        self.live_followers.setdefault(feed, set()).add(client_id)
+        if feed not in self.live_tasks:
+            self.live_tasks[feed] = asyncio.create_task(self.ingest_live(feed, path))
+        return True
+    
+    def unfollow_live(self, client_id: str):
+        """Stop pushing live frames to a client; idle feeds stop ingesting."""
+        for feed, followers in list(self.live_followers.items()):
+            followers.discard(client_id)
+            if not followers:
+                del self.live_followers[feed]
+                task = self.live_tasks.pop(feed, None)
+                if task:
+                    task.cancel()
+    
+    @staticmethod
+    def _encode_live_frames(
+        race_data: Dict[str, Any],
+        new_frames: range,
+        subscriptions: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[Union[str, bytes]]]:
+        """
+        Encode new live frames for each follower.
+        
+        Followers with identical subscriptions share one encoding.
+        
+        Args:
+            race_data: Live race data
+            new_frames: Indices of the frames to encode
+            subscriptions: Subscription of each follower
+        
+        Returns:
+            Encoded messages per follower, in frame order
+        """
+        encoded: Dict[Any, List[Union[str, bytes]]] = {}
+        payloads = {}
+        
+        for client_id, subscription in subscriptions.items():
+            key = (
+                frozenset(subscription['drivers']) if subscription['drivers'] is not None else None,
+                frozenset(subscription['channels']),
+                frozenset(subscription['detail_drivers']),
+                subscription['encoding'],
+            )
+            if key not in encoded:
+                messages = []
+                for frame_idx in new_frames:
+                    frame_data = build_frame(
+                        frame_idx, race_data['timeline'], race_data['drivers'], subscription
+                    )
+                    if subscription['encoding'] == 'binary':
+                        messages.append(encode_frame_binary(frame_data))
+                    else:
+                        messages.append(json.dumps(frame_data))
+                encoded[key] = messages
+            payloads[client_id] = encoded[key]
+        
+        return payloads
+    
+    def _ingest_update(self, live: LiveRace, tailer: FeedTailer, subscriptions: Dict[str, Dict[str, Any]]):
+        """One live update: parse new lines, advance and encode new frames."""
+        new_frames = live.ingest(tailer)
+        if not len(new_frames):
+            return {}, None
+        
+        payloads = self._encode_live_frames(live.race_data, new_frames, subscriptions)
+        leaderboard = json.dumps({'type': 'live_leaderboard', 'order': live.leaderboard()})
+        return payloads, leaderboard
+    
+    async def ingest_live(self, feed: str, path: Path):
+        """
+        Tail a feed file and push new frames to its followers.
+        
+        Parsing, interpolation and frame encoding run in a worker thread,
+        so ingestion never blocks other replay streams, and each poll parses
+        for at most INGEST_UPDATE_BUDGET seconds, so one update fits in the
+        poll interval even when starting from a large backlog. If ingestion
+        fails, the followers are told and dropped so the feed can be
+        followed again from scratch.
+        
+        Args:
+            feed: Feed name
+            path: Feed file path
+        """
+        live = LiveRace(feed)
+        tailer = FeedTailer(path)
+        logger.info(f"Started live ingestion of {path}")
+        
+        try:
+            while feed in self.live_followers:
+                started = time.perf_counter()
+                
+                subscriptions = {
+                    client_id: dict(self.subscriptions.get(client_id) or default_subscription())
+                    for client_id in self.live_followers.get(feed, ())
+                }
+                payloads, leaderboard = await asyncio.to_thread(
+                    self._ingest_update, live, tailer, subscriptions
+                )
+                
+                for client_id, messages in payloads.items():
+                    if client_id not in self.live_followers.get(feed, ()):
+                        continue
+                    for message in messages:
+                        if isinstance(message, bytes):
+                            await self.send_bytes(client_id, message)
+                        else:
+                            await self.send_text(client_id, message)
+                    await self.send_text(client_id, leaderboard)
+                
+                elapsed = time.perf_counter() - started
+                if payloads and elapsed > INGEST_POLL_INTERVAL:
+                    logger.warning(f"Live update for {feed} took {elapsed * 1000:.0f} ms")
+                
+                await asyncio.sleep(max(INGEST_POLL_INTERVAL - elapsed, 0))
+        
+        except asyncio.CancelledError:
+            logger.info(f"Live ingestion of {feed} stopped")
+        except Exception as e:
+            logger.error(f"Error ingesting live feed {feed}: {e}")
+            for client_id in self.live_followers.pop(feed, set()):
+                await self.send_message(client_id, {
+                    'type': 'error',
+                    'message': f"Live feed {feed} stopped: {e}"
+                })
+        finally:
+            # A newer task may already own the feed after unfollow/follow
+            if self.live_tasks.get(feed) is asyncio.current_task():
+                del self.live_tasks[feed]
+    
     async def stream_replay(
         self, 
         client_id: str, 
@@ -48,6 +467,9 @@ class ReplayManager:
         """
         Stream race replay data frame by frame.
         
+        Frames are filtered by the client's subscription, and the frame
+        rate is lowered automatically when the client cannot keep up.
+        
         Args:
             client_id: Client identifier
             race_data: Processed race data
@@ -60,42 +482,46 @@ class ReplayManager:
             
             logger.info(f"Starting replay stream for {client_id}, {total_frames} frames")
             
-            for frame_idx in range(total_frames):
+            loop = asyncio.get_running_loop()
+            frame_interval = 1.0 / (TELEMETRY_FREQUENCY * playback_speed)
+            stream_start = loop.time()
+            stride = 1
+            frame_idx = 0
+            
+            while frame_idx < total_frames:
                 # Check if client is still connected
                 if client_id not in self.active_connections:
                     break
                 
-                # Prepare frame data
-                frame_data = {
-                    'type': 'frame',
-                    'frame_index': frame_idx,
-                    'time': timeline[frame_idx],
-                    'drivers': {}
-                }
+                # Jump to a requested frame and restart the schedule from it
+                seek_frame = self.seek_requests.pop(client_id, None)
+                if seek_frame is not None:
+                    frame_idx = min(max(seek_frame, 0), total_frames - 1)
+                    stream_start = loop.time() - frame_idx * frame_interval
                 
-                # Add driver data for this frame
-                for driver_num, driver_data in drivers.items():
-                    telemetry = driver_data['telemetry']
-                    
-                    if frame_idx < len(telemetry['time']):
-                        frame_data['drivers'][driver_num] = {
-                            'abbreviation': driver_data['abbreviation'],
-                            'team': driver_data['team'],
-                            'team_color': driver_data['team_color'],
-                            'x': float(telemetry['x'][frame_idx]) if 'x' in telemetry else 0,
-                            'y': float(telemetry['y'][frame_idx]) if 'y' in telemetry else 0,
-                            'speed': float(telemetry['speed'][frame_idx]) if 'speed' in telemetry else 0,
-                            'gear': int(telemetry['gear'][frame_idx]) if 'gear' in telemetry else 0,
-                            'drs': int(telemetry['drs'][frame_idx]) if 'drs' in telemetry else 0,
-                        }
+                subscription = self.subscriptions.get(client_id) or default_subscription()
+                frame_data = build_frame(frame_idx, timeline, drivers, subscription)
                 
                 # Send frame
-                await self.send_message(client_id, frame_data)
+                await self.send_frame(client_id, frame_data, subscription)
+                
+                # Throttle slow clients by skipping timeline frames
+                lateness = loop.time() - (stream_start + frame_idx * frame_interval)
+                new_stride = self._adapt_stride(client_id, stride, frame_interval, lateness)
+                if new_stride != stride:
+                    stride = new_stride
+                    logger.info(f"Adjusted frame stride for {client_id} to {stride}")
+                    await self.send_message(client_id, {
+                        'type': 'frame_rate',
+                        'stride': stride,
+                        'fps': 1.0 / (frame_interval * stride),
+                    })
                 
-                # Calculate delay based on playback speed
-                # Assuming 10 Hz data (0.1s between frames)
-                delay = 0.1 / playback_speed
-                await asyncio.sleep(delay)
+                frame_idx += stride
+                
+                # Sleep until the next frame is due on the replay schedule
+                delay = stream_start + frame_idx * frame_interval - loop.time()
+                await asyncio.sleep(max(delay, 0))
             
             # Send completion message
             await self.send_message(client_id, {
@@ -138,6 +564,43 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
             if message_type == 'ping':
                 await replay_manager.send_message(client_id, {'type': 'pong'})
             
+            elif message_type == 'subscribe':
+                # Change driver/channel subscription, applies mid-stream
+                subscription = replay_manager.update_subscription(client_id, data)
+                await replay_manager.send_message(client_id, {
+                    'type': 'subscribed',
+                    'drivers': sorted(subscription['drivers']) if subscription['drivers'] is not None else None,
+                    'channels': sorted(subscription['channels']),
+                    'detail_drivers': sorted(subscription['detail_drivers']),
+                    'encoding': subscription['encoding'],
+                })
+            
+            elif message_type == 'seek':
+                # Jump to a frame, e.g. one returned by /api/events
+                try:
+                    frame_index = int(data.get('frame_index'))
+                except (TypeError, ValueError, OverflowError):
+                    await replay_manager.send_message(client_id, {
+                        'type': 'error',
+                        'message': f"Invalid frame index: {data.get('frame_index')!r}"
+                    })
+                else:
+                    replay_manager.seek(client_id, frame_index)
+            
+            elif message_type == 'follow_live':
+                # Push frames from a recorded live feed as it grows
+                feed = data.get('feed')
+                if replay_manager.follow_live(client_id, feed):
+                    await replay_manager.send_message(client_id, {'type': 'live_following', 'feed': feed})
+                else:
+                    await replay_manager.send_message(client_id, {
+                        'type': 'error',
+                        'message': f"Live feed not found: {feed}"
+                    })
+            
+            elif message_type == 'unfollow_live':
+                replay_manager.unfollow_live(client_id)
+            
             elif message_type == 'start_replay':
                 # Start replay streaming
                 race_data = data.get('race_data')
@@ -149,6 +612,7 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                         replay_manager.replay_tasks[client_id].cancel()
                     
                     # Start new replay task
+                    replay_manager.seek_requests.pop(client_id, None)
                     task = asyncio.create_task(
                         replay_manager.stream_replay(client_id, race_data, playback_speed)
                     )
@@ -0,0 +1,120 @@
+"""Distance-aligned lap comparison with a cache of resampled lap traces."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Hashable
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from backend.utils.constants import COMPARISON_DISTANCE_STEP, LAP_TRACE_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def resample_lap(
+    telemetry: "pd.DataFrame",
+    step: float = COMPARISON_DISTANCE_STEP
+) -> Dict[str, np.ndarray]:
+    """
+    Resample one lap's telemetry onto a fixed distance grid.
+    
+    The grid always starts at 0 m with the given step, so traces of
+    different laps line up index for index and can be cached once and
+    reused against any other lap.
+    
+    Args:
+        telemetry: Lap telemetry with Distance and Time columns
+        step: Grid spacing in meters
+    
+    Returns:
+        Dictionary with distance, time, speed, throttle, brake and gear arrays
+    """
+    # Distance must be non-decreasing for interpolation
+    distance = np.maximum.accumulate(telemetry['Distance'].to_numpy(dtype=float))
+    grid = np.arange(0.0, distance[-1], step)
+    
+    trace = {
+        'distance': grid,
+        'time': np.interp(grid, distance, telemetry['Time'].dt.total_seconds().to_numpy()),
+    }
+    
+    if 'Speed' in telemetry.columns:
+        trace['speed'] = np.interp(grid, distance, telemetry['Speed'].fillna(0).to_numpy(dtype=float))
+    if 'Throttle' in telemetry.columns:
+        trace['throttle'] = np.interp(grid, distance, telemetry['Throttle'].fillna(0).to_numpy(dtype=float))
+    if 'Brake' in telemetry.columns:
+        trace['brake'] = np.interp(grid, distance, telemetry['Brake'].fillna(0).to_numpy(dtype=float))
+    
+    # Gear takes the last sample at or before each grid point
+    if 'nGear' in telemetry.columns:
+        gear = telemetry['nGear'].fillna(0).to_numpy(dtype=int)
+        idx = np.clip(np.searchsorted(distance, grid, side='right') - 1, 0, len(gear) - 1)
+        trace['gear'] = gear[idx]
+    
+    return trace
+
+
+def compare_traces(traces: List[Dict[str, np.ndarray]]) -> Dict[str, Any]:
+    """
+    Align resampled traces on their common distance range.
+    
+    The first trace is the reference; every trace gets a delta curve of
+    its lap time minus the reference's at each distance.
+    
+    Args:
+        traces: Traces from resample_lap, reference first
+    
+    Returns:
+        Dictionary with the shared distance grid and truncated traces
+    """
+    length = min(len(trace['distance']) for trace in traces)
+    reference_time = traces[0]['time'][:length]
+    
+    aligned = []
+    for trace in traces:
+        channels = {
+            name: values[:length]
+            for name, values in trace.items()
+            if name != 'distance'
+        }
+        channels['delta'] = channels['time'] - reference_time
+        aligned.append(channels)
+    
+    return {
+        'distance': traces[0]['distance'][:length],
+        'traces': aligned,
+    }
+
+
+class LapTraceCache:
+    """LRU cache of resampled lap traces, safe to share across request threads."""
+    
+    def __init__(self, max_size: int = LAP_TRACE_CACHE_SIZE):
+        """Initialize an empty cache holding at most max_size traces."""
+        self.max_size = max_size
+        self._traces: "OrderedDict[Hashable, Dict[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Dict[str, np.ndarray]]:
+        """Get a cached trace, marking it as recently used."""
+        with self._lock:
+            trace = self._traces.get(key)
+            if trace is not None:
+                self._traces.move_to_end(key)
+            return trace
+    
+    def put(self, key: Hashable, trace: Dict[str, np.ndarray]):
+        """Cache a trace, evicting the least recently used when full."""
+        with self._lock:
+            self._traces[key] = trace
+            self._traces.move_to_end(key)
+            while len(self._traces) > self.max_size:
+                self._traces.popitem(last=False)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._traces)
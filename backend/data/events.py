@@ -0,0 +1,239 @@
+"""Race event detection and a frame-indexed event table for seeking."""
+
+import logging
+from typing import Dict, List, Any, Iterable, Optional
+
+import numpy as np
+
+from backend.utils.constants import EVENT_TYPES, DRS_OPEN_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+
+def _rising_edges(active: np.ndarray) -> np.ndarray:
+    """Frame indices where a boolean (drivers x frames) matrix turns on."""
+    edges = active[:, 1:] & ~active[:, :-1]
+    return np.nonzero(edges)
+
+
+def _stack_channel(drivers: Dict[str, Any], numbers: List[str], channel: str, n_frames: int, fill: int) -> np.ndarray:
+    """Stack one integer channel of every driver into a (drivers x frames) matrix."""
+    matrix = np.full((len(numbers), n_frames), fill, dtype=np.int32)
+    for row, number in enumerate(numbers):
+        values = drivers[number]['telemetry'].get(channel)
+        if values is not None:
+            values = np.asarray(values)[:n_frames]
+            matrix[row, :len(values)] = values
+    return matrix
+
+
+def _crossing_positions(
+    position: np.ndarray,
+    timeline: np.ndarray,
+    numbers: List[str],
+    lap_ends: Optional[Dict[str, np.ndarray]],
+    times: np.ndarray
+) -> np.ndarray:
+    """
+    Each driver's position at their own lap completion nearest to each time.
+    
+    Positions only update at a driver's own line crossing, so comparing
+    drivers at the same frame mixes fresh and stale positions. Comparing
+    each driver's crossing around the same moment gives a consistent order.
+    Without lap_ends the positions at the frames of the given times are used.
+    """
+    frames = np.searchsorted(timeline, times).clip(0, len(timeline) - 1)
+    result = position[:, frames]
+    if not lap_ends:
+        return result
+    
+    for row, number in enumerate(numbers):
+        ends = lap_ends.get(number)
+        if ends is None or len(ends) == 0:
+            continue
+        idx = np.searchsorted(ends, times)
+        lo = (idx - 1).clip(0, len(ends) - 1)
+        hi = idx.clip(0, len(ends) - 1)
+        nearest = np.where(np.abs(ends[hi] - times) < np.abs(ends[lo] - times), hi, lo)
+        crossing_frames = np.searchsorted(timeline, ends[nearest]).clip(0, len(timeline) - 1)
+        result[row] = position[row, crossing_frames]
+    return result
+
+
+def _lap_start_times(
+    timeline: np.ndarray,
+    lap_ends: Optional[np.ndarray],
+    event_frames: np.ndarray
+) -> np.ndarray:
+    """Time at which the lap completed at each event frame began."""
+    if lap_ends is None or len(lap_ends) == 0:
+        return timeline[np.maximum(event_frames - 1, 0)]
+    
+    # Index of the lap completed at each frame, then the previous lap's end
+    lap_idx = np.searchsorted(lap_ends, timeline[event_frames], side='right') - 1
+    return np.where(lap_idx >= 1, lap_ends[np.maximum(lap_idx - 1, 0)], timeline[0])
+
+
+def detect_events(
+    drivers: Dict[str, Any],
+    timeline: np.ndarray,
+    retirements: Optional[Dict[str, float]] = None,
+    lap_ends: Optional[Dict[str, np.ndarray]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Detect race events over the per-frame arrays of all drivers at once.
+    
+    The position channel only changes when a driver completes a lap, so
+    overtakes are lap-granular: each one is placed at the start/finish
+    crossing that completes the lap on which the pass happened. Places
+    gained on drivers who were in the pits during that lap, or who had
+    already retired, are not reported as overtakes.
+    
+    Args:
+        drivers: Processed driver data keyed by driver number
+        timeline: Timeline array in seconds
+        retirements: Seconds from race start at which retired drivers stopped
+        lap_ends: Sorted lap completion times in seconds per driver, used to
+            find the lap each overtake happened on and to compare drivers at
+            their own crossings; without it overtaken drivers are guessed
+            from positions at the same frame
+    
+    Returns:
+        Events sorted by frame, each with frame, time, type, driver and,
+        for overtakes, the overtaken driver
+    """
+    timeline = np.asarray(timeline)
+    n_frames = len(timeline)
+    numbers = list(drivers.keys())
+    if n_frames < 2 or not numbers:
+        return []
+    
+    frames, types, rows, others = [], [], [], []
+    
+    def add(event_type: str, driver_rows: np.ndarray, event_frames: np.ndarray, other_rows=None):
+        frames.append(event_frames)
+        types.append(np.full(len(event_frames), EVENT_TYPES.index(event_type)))
+        rows.append(driver_rows)
+        others.append(other_rows if other_rows is not None else np.full(len(event_frames), -1))
+    
+    position = _stack_channel(drivers, numbers, 'position', n_frames, -1)
+    in_pit = _stack_channel(drivers, numbers, 'in_pit', n_frames, 0) > 0
+    
+    retired_at = np.full(len(numbers), np.inf)
+    for number, t in (retirements or {}).items():
+        if number in drivers:
+            retired_at[numbers.index(number)] = t
+    
+    # Overtakes: a driver gains places when completing a lap; the overtaken
+    # drivers are those ahead at the previous crossing and not ahead at this one
+    known = (position[:, 1:] > 0) & (position[:, :-1] > 0)
+    driver_rows, prev_frames = np.nonzero(known & (position[:, 1:] < position[:, :-1]))
+    if len(driver_rows):
+        # Running count of in-pit frames, for "pitted during this lap" checks
+        pit_count = np.zeros((len(numbers), n_frames + 1), dtype=np.int32)
+        np.cumsum(in_pit, axis=1, out=pit_count[:, 1:])
+        
+        event_frames = prev_frames + 1
+        lap_starts = np.empty(len(driver_rows))
+        for row in np.unique(driver_rows):
+            mask = driver_rows == row
+            ends = lap_ends.get(numbers[row]) if lap_ends else None
+            lap_starts[mask] = _lap_start_times(timeline, ends, event_frames[mask])
+        
+        before = _crossing_positions(position, timeline, numbers, lap_ends, lap_starts)
+        after = _crossing_positions(position, timeline, numbers, lap_ends, timeline[event_frames])
+        start_frames = np.searchsorted(timeline, lap_starts)
+        
+        passer_rows, passed_rows, pass_frames = [], [], []
+        for i, (row, frame) in enumerate(zip(driver_rows, event_frames)):
+            ahead_before = (before[:, i] > 0) & (before[:, i] < position[row, frame - 1])
+            behind_after = after[:, i] >= position[row, frame]
+            pitted = pit_count[:, frame + 1] > pit_count[:, start_frames[i]]
+            retired = retired_at <= timeline[frame]
+            for other in np.flatnonzero(ahead_before & behind_after & ~pitted & ~retired):
+                passer_rows.append(row)
+                passed_rows.append(other)
+                pass_frames.append(frame)
+        
+        add('overtake', np.array(passer_rows, dtype=int), np.array(pass_frames, dtype=int), np.array(passed_rows, dtype=int))
+    
+    # Pit entries and exits from the in_pit flags
+    driver_rows, prev_frames = _rising_edges(in_pit)
+    add('pit_entry', driver_rows, prev_frames + 1)
+    driver_rows, prev_frames = _rising_edges(~in_pit)
+    add('pit_exit', driver_rows, prev_frames + 1)
+    
+    # DRS activations when the flap opens
+    drs_open = _stack_channel(drivers, numbers, 'drs', n_frames, 0) >= DRS_OPEN_THRESHOLD
+    driver_rows, prev_frames = _rising_edges(drs_open)
+    add('drs_activation', driver_rows, prev_frames + 1)
+    
+    # Retirements at the end of the driver's last completed lap
+    retired_rows = np.flatnonzero(np.isfinite(retired_at))
+    if len(retired_rows):
+        retired_frames = np.searchsorted(timeline, retired_at[retired_rows]).clip(0, n_frames - 1)
+        add('retirement', retired_rows, retired_frames)
+    
+    frames = np.concatenate(frames)
+    types = np.concatenate(types)
+    rows = np.concatenate(rows)
+    others = np.concatenate(others)
+    order = np.lexsort((rows, types, frames))
+    
+    events = []
+    for i in order:
+        event = {
+            'frame': int(frames[i]),
+            'time': float(timeline[frames[i]]),
+            'type': EVENT_TYPES[types[i]],
+            'driver': numbers[rows[i]],
+        }
+        if others[i] >= 0:
+            event['other_driver'] = numbers[others[i]]
+        events.append(event)
+    
+    logger.info(f"Detected {len(events)} race events")
+    return events
+
+
+class EventIndex:
+    """Columnar, time-sorted view of a race's events for filtered queries."""
+    
+    def __init__(self, events: List[Dict[str, Any]]):
+        """Build the index from events sorted by frame."""
+        self.events = events
+        self.times = np.array([e['time'] for e in events], dtype=float)
+        self.types = np.array([e['type'] for e in events], dtype=object)
+        self.drivers = np.array([e['driver'] for e in events], dtype=object)
+        self.others = np.array([e.get('other_driver', '') for e in events], dtype=object)
+    
+    def filter(
+        self,
+        types: Optional[Iterable[str]] = None,
+        drivers: Optional[Iterable[str]] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get events matching every given filter.
+        
+        Args:
+            types: Event types to include
+            drivers: Driver numbers involved (as driver or overtaken driver)
+            start_time: Earliest event time in seconds
+            end_time: Latest event time in seconds
+        
+        Returns:
+            Matching events sorted by frame
+        """
+        lo = 0 if start_time is None else np.searchsorted(self.times, start_time, side='left')
+        hi = len(self.times) if end_time is None else np.searchsorted(self.times, end_time, side='right')
+        
+        mask = np.ones(max(hi - lo, 0), dtype=bool)
+        if types:
+            mask &= np.isin(self.types[lo:hi], list(types))
+        if drivers:
+            drivers = list(drivers)
+            mask &= np.isin(self.drivers[lo:hi], drivers) | np.isin(self.others[lo:hi], drivers)
+        
+        return [self.events[lo + i] for i in np.flatnonzero(mask)]
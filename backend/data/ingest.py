@@ -0,0 +1,429 @@
+"""Incremental ingestion of a recorded live-timing feed file.
+
+The feed is a JSON-lines file standing in for the live timing service.
+Each line is either a telemetry sample:
+
+    {"t": 3605.2, "driver": "44", "x": 1234.0, "y": -567.0, "speed": 287.0,
+     "gear": 7, "drs": 12, "position": 3}
+
+where t is session time in seconds, driver is the car number and every
+channel is optional (numbers or null), or a driver record:
+
+    {"type": "driver", "driver": "44", "abbreviation": "HAM",
+     "team": "Mercedes", "team_color": "#27F4D2"}
+
+Samples are appended to per-driver columnar buffers as the file grows, and
+only the newly covered part of the timeline is interpolated. Lines that
+are not valid JSON or do not match these shapes are logged and skipped.
+"""
+
+import json
+import logging
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from backend.utils.constants import (
+    TELEMETRY_FREQUENCY,
+    INGEST_DELAY,
+    INGEST_BATCH_LINES,
+    INGEST_READ_SIZE,
+    INGEST_UPDATE_BUDGET,
+)
+
+logger = logging.getLogger(__name__)
+
+# Channels carried by the feed; held channels keep their last sample value
+# instead of being interpolated
+LINEAR_CHANNELS = ["x", "y", "speed"]
+HELD_CHANNELS = ["gear", "drs", "position"]
+
+
+def _is_number(value: Any) -> bool:
+    """Whether a parsed JSON value is a finite number."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and np.isfinite(value)
+
+
+def _parse_record(record: Any) -> Optional[Dict[str, Any]]:
+    """
+    Validate one parsed feed line.
+    
+    Driver numbers must be numeric and fit the binary frame's uint16 field,
+    sample times must be finite numbers, and channel values numbers or null.
+    
+    Args:
+        record: Parsed JSON value of the line
+    
+    Returns:
+        The record with its driver as a string and missing or null channels
+        as NaN, or None if the line is not a valid driver or sample record
+    """
+    if not isinstance(record, dict):
+        return None
+    
+    driver = record.get('driver')
+    if isinstance(driver, bool) or not isinstance(driver, (int, str)):
+        return None
+    driver = str(driver)
+    if not driver.isdigit() or int(driver) > 0xFFFF:
+        return None
+    
+    if record.get('type') == 'driver':
+        return {
+            'type': 'driver',
+            'driver': driver,
+            'abbreviation': str(record.get('abbreviation', driver)),
+            'team': str(record.get('team', '')),
+            'team_color': str(record.get('team_color', '#FFFFFF')),
+        }
+    
+    if not _is_number(record.get('t')):
+        return None
+    
+    sample = {'t': float(record['t']), 'driver': driver}
+    for channel in LINEAR_CHANNELS + HELD_CHANNELS:
+        value = record.get(channel)
+        if value is None:
+            sample[channel] = np.nan
+        elif _is_number(value):
+            sample[channel] = float(value)
+        else:
+            return None
+    return sample
+
+
+class ColumnBuffer:
+    """Growable columnar buffer with amortized O(1) appends."""
+    
+    def __init__(self, columns: Dict[str, Any], capacity: int = 1024):
+        """
+        Initialize an empty buffer.
+        
+        Args:
+            columns: Column names mapped to numpy dtypes
+            capacity: Initial number of rows
+        """
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in columns.items()}
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def append(self, rows: Dict[str, np.ndarray]):
+        """Append a batch of rows given as equal-length column arrays."""
+        count = len(next(iter(rows.values())))
+        needed = self._size + count
+        
+        capacity = len(next(iter(self._data.values())))
+        if needed > capacity:
+            # Double until the batch fits
+            while capacity < needed:
+                capacity *= 2
+            for name, column in self._data.items():
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[:self._size] = column[:self._size]
+                self._data[name] = grown
+        
+        for name, values in rows.items():
+            self._data[name][self._size:needed] = values
+        self._size = needed
+    
+    def column(self, name: str) -> np.ndarray:
+        """View of a column's filled rows (invalidated by the next append)."""
+        return self._data[name][:self._size]
+
+
+class FeedTailer:
+    """Reads lines appended to a file since the previous read."""
+    
+    def __init__(self, path: Path):
+        """Initialize a tailer positioned at the start of the file."""
+        self.path = Path(path)
+        self._offset = 0
+        self._partial = b''
+        self._lines: "deque[bytes]" = deque()
+    
+    def read_lines(self, max_lines: int = INGEST_BATCH_LINES) -> List[bytes]:
+        """
+        Get up to max_lines complete new lines.
+        
+        The file is read in INGEST_READ_SIZE chunks only until max_lines
+        lines are buffered, so a large backlog is worked through in bounded
+        steps instead of being read and split in one go.
+        """
+        if len(self._lines) < max_lines and self.path.exists():
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                while len(self._lines) < max_lines:
+                    chunk = f.read(INGEST_READ_SIZE)
+                    if not chunk:
+                        break
+                    self._offset += len(chunk)
+                    *complete, self._partial = (self._partial + chunk).split(b'\n')
+                    self._lines.extend(line for line in complete if line.strip())
+        
+        return [self._lines.popleft() for _ in range(min(max_lines, len(self._lines)))]
+
+
+class LiveRace:
+    """
+    Race data built incrementally from feed samples.
+    
+    Raw samples go into one ColumnBuffer per driver. advance() extends the
+    timeline up to INGEST_DELAY behind the newest sample and interpolates
+    just the new frames, so each update costs O(new samples + new frames).
+    """
+    
+    def __init__(self, name: str):
+        """Initialize an empty live race."""
+        self.name = name
+        self.start_time: Optional[float] = None
+        self.latest_time: Optional[float] = None
+        self.driver_info: Dict[str, Dict[str, Any]] = {}
+        self.samples: Dict[str, ColumnBuffer] = {}
+        self.frames: Dict[str, ColumnBuffer] = {}
+        self.timeline = ColumnBuffer({'time': np.float64})
+    
+    def _new_frame_buffer(self) -> ColumnBuffer:
+        columns = {channel: np.float32 for channel in LINEAR_CHANNELS}
+        columns.update({channel: np.int16 for channel in HELD_CHANNELS})
+        frames = ColumnBuffer(columns)
+        
+        # Drivers joining late get empty frames up to the current one
+        if len(self.timeline):
+            missing = len(self.timeline)
+            rows = {channel: np.full(missing, np.nan) for channel in LINEAR_CHANNELS}
+            rows.update({channel: np.full(missing, -1) for channel in HELD_CHANNELS})
+            frames.append(rows)
+        return frames
+    
+    def add_lines(self, lines: List[bytes]) -> int:
+        """
+        Parse feed lines and append their samples.
+        
+        Args:
+            lines: Raw JSON lines from the feed
+        
+        Returns:
+            Number of samples added
+        """
+        by_driver: Dict[str, List[Dict[str, Any]]] = {}
+        
+        for line in lines:
+            try:
+                record = _parse_record(json.loads(line))
+            except ValueError:
+                record = None
+            if record is None:
+                logger.warning(f"Skipping malformed feed line in {self.name}")
+                continue
+            
+            driver = record['driver']
+            if record.get('type') == 'driver':
+                self.driver_info[driver] = {
+                    'abbreviation': record['abbreviation'],
+                    'team': record['team'],
+                    'team_color': record['team_color'],
+                }
+            else:
+                by_driver.setdefault(driver, []).append(record)
+        
+        added = 0
+        first_times = []
+        for driver, records in by_driver.items():
+            if driver not in self.samples:
+                columns = {'t': np.float64}
+                columns.update({channel: np.float64 for channel in LINEAR_CHANNELS + HELD_CHANNELS})
+                self.samples[driver] = ColumnBuffer(columns)
+                self.frames[driver] = self._new_frame_buffer()
+                self.driver_info.setdefault(driver, {
+                    'abbreviation': driver,
+                    'team': '',
+                    'team_color': '#FFFFFF',
+                })
+            
+            buffer = self.samples[driver]
+            last_t = buffer.column('t')[-1] if len(buffer) else -np.inf
+            
+            # Samples must be time ordered; late arrivals are dropped
+            records.sort(key=lambda r: r['t'])
+            records = [r for r in records if r['t'] > last_t]
+            if not records:
+                continue
+            
+            rows = {'t': np.array([r['t'] for r in records], dtype=np.float64)}
+            for channel in LINEAR_CHANNELS:
+                rows[channel] = np.array([r[channel] for r in records], dtype=np.float64)
+            for channel in HELD_CHANNELS:
+                # Forward-fill from the previous sample; feeds may only send changes
+                previous = buffer.column(channel)[-1] if len(buffer) else np.nan
+                values = np.array([previous] + [r[channel] for r in records], dtype=np.float64)
+                fill_idx = np.maximum.accumulate(np.where(~np.isnan(values), np.arange(len(values)), 0))
+                rows[channel] = values[fill_idx][1:]
+            buffer.append(rows)
+            added += len(records)
+            
+            first_times.append(rows['t'][0])
+            last = rows['t'][-1]
+            self.latest_time = last if self.latest_time is None else max(self.latest_time, last)
+        
+        # The timeline starts at the earliest sample of the first batch
+        if self.start_time is None and first_times:
+            self.start_time = min(first_times)
+        
+        return added
+    
+    def advance(self) -> range:
+        """
+        Extend the timeline and interpolate the newly covered frames.
+        
+        Returns:
+            Indices of the new frames
+        """
+        first_new = len(self.timeline)
+        if self.start_time is None:
+            return range(first_new, first_new)
+        
+        watermark = self.latest_time - INGEST_DELAY
+        last_frame = int(np.floor((watermark - self.start_time) * TELEMETRY_FREQUENCY))
+        if last_frame < first_new:
+            return range(first_new, first_new)
+        
+        # Session times of the new frames
+        times = self.start_time + np.arange(first_new, last_frame + 1) / TELEMETRY_FREQUENCY
+        
+        for driver, buffer in self.samples.items():
+            sample_t = buffer.column('t')
+            # Only the samples around the new window are touched
+            lo = max(int(np.searchsorted(sample_t, times[0])) - 1, 0)
+            window_t = sample_t[lo:]
+            
+            rows = {}
+            for channel in LINEAR_CHANNELS:
+                values = buffer.column(channel)[lo:]
+                known = ~np.isnan(values)
+                if known.any():
+                    rows[channel] = np.interp(times, window_t[known], values[known], left=np.nan)
+                else:
+                    rows[channel] = np.full(len(times), np.nan)
+            
+            # Held channels are forward-filled on ingest, so the last
+            # sample at or before each frame carries the current value
+            idx = np.searchsorted(window_t, times, side='right') - 1
+            for channel in HELD_CHANNELS:
+                values = buffer.column(channel)[lo:]
+                held = np.full(len(times), -1, dtype=np.int16)
+                valid = idx >= 0
+                picked = values[idx[valid]]
+                held[np.flatnonzero(valid)[~np.isnan(picked)]] = picked[~np.isnan(picked)]
+                rows[channel] = held
+            
+            self.frames[driver].append(rows)
+        
+        self.timeline.append({'time': times - self.start_time})
+        return range(first_new, last_frame + 1)
+    
+    def ingest(self, tailer: FeedTailer, budget: float = INGEST_UPDATE_BUDGET) -> range:
+        """
+        Parse new feed lines for up to budget seconds, then advance.
+        
+        Lines are parsed in INGEST_BATCH_LINES batches and whatever is left
+        waits for the next call, so one update stays within the budget even
+        when catching up on a large backlog.
+        
+        Args:
+            tailer: Tailer of this race's feed file
+            budget: Seconds to spend parsing
+        
+        Returns:
+            Indices of the new frames
+        """
+        started = time.perf_counter()
+        while time.perf_counter() - started < budget:
+            lines = tailer.read_lines()
+            if not lines:
+                break
+            self.add_lines(lines)
+        return self.advance()
+    
+    @property
+    def race_data(self) -> Dict[str, Any]:
+        """Current frames in the shape of processed race data (views, no copies)."""
+        timeline = self.timeline.column('time')
+        drivers = {}
+        
+        for driver, frames in self.frames.items():
+            telemetry = {'time': timeline}
+            for channel in LINEAR_CHANNELS + HELD_CHANNELS:
+                telemetry[channel] = frames.column(channel)
+            drivers[driver] = {**self.driver_info[driver], 'telemetry': telemetry}
+        
+        return {
+            'timeline': timeline,
+            'drivers': drivers,
+            'total_frames': len(timeline),
+        }
+    
+    def leaderboard(self) -> List[str]:
+        """Driver numbers in running order at the latest frame."""
+        if not len(self.timeline):
+            return []
+        
+        latest = {
+            driver: int(frames.column('position')[-1])
+            for driver, frames in self.frames.items()
+        }
+        ranked = sorted((pos, driver) for driver, pos in latest.items() if pos > 0)
+        return [driver for _, driver in ranked]
+
+
+def simulate_feed(source: str, target: str, speed: float = 1.0):
+    """
+    Write a recorded feed to a target file at its original pace.
+    
+    Stands in for the live timing service: lines from source are appended
+    to target when their session time comes up.
+    
+    Args:
+        source: Recorded feed file
+        target: File to append to (e.g. feeds/<name>.jsonl)
+        speed: Playback speed multiplier
+    """
+    with open(source, 'rb') as src, open(target, 'ab') as dst:
+        start_wall = time.monotonic()
+        start_t = None
+        
+        for line in src:
+            try:
+                record = _parse_record(json.loads(line))
+            except ValueError:
+                continue
+            
+            t = record.get('t') if record is not None else None
+            if t is not None:
+                start_t = t if start_t is None else start_t
+                delay = (t - start_t) / speed - (time.monotonic() - start_wall)
+                if delay > 0:
+                    dst.flush()
+                    time.sleep(delay)
+            
+            dst.write(line if line.endswith(b'\n') else line + b'\n')
+        
+        dst.flush()
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Replay a recorded feed into a live feed file")
+    parser.add_argument("source", help="Recorded feed (.jsonl)")
+    parser.add_argument("target", help="Live feed file to append to, e.g. feeds/monaco.jsonl")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed multiplier")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    Path(args.target).parent.mkdir(parents=True, exist_ok=True)
+    simulate_feed(args.source, args.target, args.speed)
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 import logging
 
+from backend.data.residency import SessionResidency
 from backend.utils.constants import CACHE_DIR, CACHE_ENABLED
 
 # Configure logging
@@ -24,6 +25,15 @@ class F1DataLoader:
         if CACHE_ENABLED:
             fastf1.Cache.enable_cache(str(self.cache_dir))
             logger.info(f"FastF1 cache enabled at: {self.cache_dir}")
+        
+        # Loaded sessions, and the lightweight metadata kept after release
+        self.sessions = SessionResidency()
+        self.metadata_cache: Dict[str, Dict[str, Any]] = {}
+    
+    @staticmethod
+    def session_key(year: int, gp: str, session_type: str) -> str:
+        """Key identifying a session in the caches."""
+        return f"{year}_{gp}_{session_type}"
     
     def load_session(
         self, 
@@ -34,6 +44,9 @@ class F1DataLoader:
         """
         Load a specific F1 session.
         
+        Loaded sessions stay resident in memory (see SessionResidency), and
+        concurrent loads of the same session share one load.
+        
         Args:
             year: Year of the race
             gp: Grand Prix name or round number
@@ -42,6 +55,18 @@ class F1DataLoader:
         Returns:
             FastF1 Session object or None if loading fails
         """
+        return self.sessions.get_or_load(
+            self.session_key(year, gp, session_type),
+            lambda: self._load_session(year, gp, session_type)
+        )
+    
+    def _load_session(
+        self,
+        year: int,
+        gp: str,
+        session_type: str
+    ) -> Optional[fastf1.core.Session]:
+        """Load a session from FastF1 (disk cache or API)."""
         try:
             logger.info(f"Loading {year} {gp} {session_type}")
             session = fastf1.get_session(year, gp, session_type)
@@ -52,6 +77,55 @@ class F1DataLoader:
             logger.error(f"Error loading session: {e}")
             return None
     
+    def release_session(self, year: int, gp: str, session_type: str = "R"):
+        """
+        Drop a loaded session from memory once it has been processed.
+        
+        Metadata is computed first so session and track lookups keep
+        working without reloading.
+        
+        Args:
+            year: Year of the race
+            gp: Grand Prix name or round number
+            session_type: Session type
+        """
+        self.get_session_metadata(year, gp, session_type)
+        self.sessions.release(self.session_key(year, gp, session_type))
+    
+    def get_session_metadata(
+        self,
+        year: int,
+        gp: str,
+        session_type: str = "R"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get session info, drivers and track layout, loading the session once.
+        
+        Args:
+            year: Year of the race
+            gp: Grand Prix name or round number
+            session_type: Session type
+        
+        Returns:
+            Dictionary with session, drivers_info and track, or None if the
+            session could not be loaded
+        """
+        key = self.session_key(year, gp, session_type)
+        if key in self.metadata_cache:
+            return self.metadata_cache[key]
+        
+        session = self.load_session(year, gp, session_type)
+        if not session:
+            return None
+        
+        metadata = {
+            'session': self.get_session_info(session),
+            'drivers_info': self.get_drivers_info(session),
+            'track': self.get_track_data(session),
+        }
+        self.metadata_cache[key] = metadata
+        return metadata
+    
     def get_available_races(self, year: int) -> list:
         """
         Get list of available races for a given year.
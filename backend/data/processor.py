@@ -6,6 +6,8 @@ from typing import Dict, List, Any, Optional
 import logging
 from scipy.interpolate import interp1d
 
+from backend.data.events import detect_events
+from backend.data.stints import StintIndex
 from backend.utils.constants import TELEMETRY_FREQUENCY, INTERPOLATION_METHOD
 
 logger = logging.getLogger(__name__)
@@ -167,6 +169,59 @@ class RaceDataProcessor:
             logger.error(f"Error interpolating driver {driver_number}: {e}")
             return None
     
+    def get_lap_telemetry(self, driver_number: str, lap_number: int) -> Optional[pd.DataFrame]:
+        """
+        Get full telemetry for a single lap of a driver.
+        
+        Args:
+            driver_number: Driver number or abbreviation
+            lap_number: Lap number
+        
+        Returns:
+            Lap telemetry DataFrame (with Distance), or None if unavailable
+        """
+        try:
+            driver_laps = self.laps.pick_driver(driver_number)
+            lap = driver_laps[driver_laps['LapNumber'] == lap_number]
+            if lap.empty:
+                return None
+            
+            telemetry = lap.iloc[0].get_telemetry()
+            if telemetry.empty or 'Distance' not in telemetry.columns:
+                return None
+            
+            return telemetry
+        except Exception as e:
+            logger.error(f"Error getting telemetry for driver {driver_number} lap {lap_number}: {e}")
+            return None
+    
+    def get_retirements(self, stint_index: StintIndex) -> Dict[str, float]:
+        """
+        Find drivers who did not finish and when they stopped.
+        
+        Args:
+            stint_index: Index built for this session
+        
+        Returns:
+            Seconds from race start of each retired driver's last completed lap
+        """
+        retirements = {}
+        
+        try:
+            for _, result in self.session.results.iterrows():
+                status = str(result['Status'])
+                # Classified finishers are 'Finished' or '+N Lap(s)'
+                if status in ('Finished', '', 'nan') or status.startswith('+'):
+                    continue
+                
+                last_lap_end = stint_index.last_lap_end(result['DriverNumber'])
+                if last_lap_end is not None:
+                    retirements[str(result['DriverNumber'])] = last_lap_end
+        except Exception as e:
+            logger.error(f"Error getting retirements: {e}")
+        
+        return retirements
+    
     def process_race_data(self) -> Dict[str, Any]:
         """
         Process complete race data for all drivers.
@@ -183,6 +238,9 @@ class RaceDataProcessor:
             logger.error("Failed to create timeline")
             return {}
         
+        # Tyre and pit status per frame
+        stint_index = StintIndex(self.laps, self.drivers, race_start)
+        
         # Process each driver
         drivers_data = {}
         
@@ -191,6 +249,7 @@ class RaceDataProcessor:
             driver_data = self.interpolate_driver_data(driver_number, timeline, race_start)
             
             if driver_data:
+                driver_data.update(stint_index.frame_arrays(driver_number, timeline))
                 drivers_data[str(driver_number)] = {
                     'abbreviation': driver_info['Abbreviation'],
                     'full_name': f"{driver_info['FirstName']} {driver_info['LastName']}",
@@ -201,9 +260,18 @@ class RaceDataProcessor:
         
         logger.info(f"Processed data for {len(drivers_data)} drivers")
         
+        # Detect race events over the per-frame arrays
+        events = detect_events(
+            drivers_data,
+            timeline,
+            self.get_retirements(stint_index),
+            stint_index.lap_ends()
+        )
+        
         return {
             'timeline': timeline.tolist(),
             'drivers': drivers_data,
+            'events': events,
             'total_frames': len(timeline),
             'duration': float(timeline[-1]) if len(timeline) > 0 else 0,
         }
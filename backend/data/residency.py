@@ -0,0 +1,106 @@
+"""In-memory residency of loaded FastF1 sessions."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from backend.utils.constants import SESSION_CACHE_SIZE, SESSION_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+
+class SessionResidency:
+    """
+    LRU of loaded sessions with a size and idle-time budget.
+    
+    Concurrent requests for a session that is still loading wait for the
+    in-flight load instead of starting their own. While any session is
+    resident, a background timer sweeps out idle sessions every TTL, so they
+    are freed even when no further requests arrive.
+    """
+    
+    def __init__(self, max_sessions: int = SESSION_CACHE_SIZE, ttl: float = SESSION_CACHE_TTL):
+        """Initialize an empty residency."""
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._pending: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Timer] = None
+    
+    def _evict(self):
+        """Drop sessions idle longer than the TTL, then the least recently used."""
+        now = time.monotonic()
+        for key in [k for k, (_, used_at) in self._sessions.items() if now - used_at > self.ttl]:
+            del self._sessions[key]
+            logger.info(f"Evicted idle session {key}")
+        while len(self._sessions) > self.max_sessions:
+            key, _ = self._sessions.popitem(last=False)
+            logger.info(f"Evicted session {key}")
+        
+        # Keep sweeping while anything is resident; called with the lock held
+        if self._sessions and self._sweeper is None:
+            self._sweeper = threading.Timer(self.ttl, self.sweep)
+            self._sweeper.daemon = True
+            self._sweeper.start()
+    
+    def sweep(self):
+        """Evict idle sessions; runs periodically while sessions are resident."""
+        with self._lock:
+            self._sweeper = None
+            self._evict()
+    
+    def get_or_load(self, key: Hashable, load: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        Get a resident session, loading it if needed.
+        
+        Args:
+            key: Session key
+            load: Callable returning the loaded session, or None on failure
+        
+        Returns:
+            The session, or None if loading failed (failures are not cached)
+        """
+        with self._lock:
+            self._evict()
+            entry = self._sessions.get(key)
+            if entry is not None:
+                self._sessions[key] = (entry[0], time.monotonic())
+                self._sessions.move_to_end(key)
+                return entry[0]
+            
+            future = self._pending.get(key)
+            is_loader = future is None
+            if is_loader:
+                future = Future()
+                self._pending[key] = future
+        
+        if not is_loader:
+            logger.info(f"Waiting for in-flight load of {key}")
+            return future.result()
+        
+        session = None
+        try:
+            session = load()
+        finally:
+            with self._lock:
+                del self._pending[key]
+                if session is not None:
+                    self._sessions[key] = (session, time.monotonic())
+                    self._evict()
+            future.set_result(session)
+        
+        return session
+    
+    def release(self, key: Hashable):
+        """Drop a session so its telemetry can be freed."""
+        with self._lock:
+            if self._sessions.pop(key, None) is not None:
+                logger.info(f"Released session {key}")
+            self._evict()
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -0,0 +1,206 @@
+"""Stint, tyre, position and pit-stop interval index for per-frame lookups."""
+
+import bisect
+import logging
+from typing import Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.constants import TYRE_COMPOUNDS
+
+logger = logging.getLogger(__name__)
+
+
+def _to_seconds(times: pd.Series, race_start) -> np.ndarray:
+    """Convert session timedeltas to float seconds from race start (NaT -> NaN)."""
+    return (times - race_start).dt.total_seconds().to_numpy(dtype=float)
+
+
+def compound_code(compound: Any) -> int:
+    """Get the streamed code for a compound name, -1 if unknown."""
+    if not isinstance(compound, str):
+        return -1
+    compound = compound.upper()
+    return TYRE_COMPOUNDS.index(compound) if compound in TYRE_COMPOUNDS else -1
+
+
+class StintIndex:
+    """
+    Sorted interval index of stints, laps, positions and pit stops.
+    
+    All times are seconds from race start, matching the replay timeline.
+    Single lookups use bisect; frame_arrays resolves a whole timeline at
+    once with np.searchsorted.
+    """
+    
+    def __init__(self, laps, drivers, race_start):
+        """
+        Build the index from a session's laps.
+        
+        Args:
+            laps: FastF1 Laps object
+            drivers: Driver numbers to index
+            race_start: Race start timestamp (timeline zero)
+        """
+        self.laps: Dict[str, Dict[str, np.ndarray]] = {}
+        self.stints: Dict[str, Dict[str, np.ndarray]] = {}
+        self.pits: Dict[str, Dict[str, np.ndarray]] = {}
+        self.positions: Dict[str, Dict[str, np.ndarray]] = {}
+        
+        for driver in drivers:
+            try:
+                self._index_driver(str(driver), laps.pick_driver(driver), race_start)
+            except Exception as e:
+                logger.error(f"Error indexing stints for driver {driver}: {e}")
+    
+    def _index_driver(self, driver: str, driver_laps, race_start):
+        """Build the lap, stint, position and pit arrays for one driver."""
+        if driver_laps.empty:
+            return
+        
+        driver_laps = driver_laps.sort_values('LapNumber')
+        lap_start = _to_seconds(driver_laps['LapStartTime'], race_start)
+        valid = ~np.isnan(lap_start)
+        
+        # Lap intervals: tyre age is read from the lap in progress
+        tyre_life = driver_laps['TyreLife'].fillna(-1).to_numpy(dtype=int)
+        laps = {
+            'start': lap_start[valid],
+            'tyre_life': tyre_life[valid],
+        }
+        
+        # Stint intervals start at the first lap of each stint
+        stint = driver_laps['Stint'].to_numpy()[valid]
+        compounds = driver_laps['Compound'].to_numpy()[valid]
+        first_lap = np.ones(len(stint), dtype=bool)
+        first_lap[1:] = stint[1:] != stint[:-1]
+        stints = {
+            'start': lap_start[valid][first_lap],
+            'compound': np.array([compound_code(c) for c in compounds[first_lap]], dtype=np.int8),
+        }
+        
+        # Position intervals start when the lap is completed
+        lap_end = _to_seconds(driver_laps['Time'], race_start)
+        lap_positions = driver_laps['Position'].fillna(-1).to_numpy(dtype=int)
+        completed = ~np.isnan(lap_end)
+        positions = {
+            'start': lap_end[completed],
+            'position': lap_positions[completed],
+        }
+        
+        # Pit intervals: each pit entry pairs with the next pit exit
+        pit_in = np.sort(_to_seconds(driver_laps['PitInTime'], race_start))
+        pit_out = np.sort(_to_seconds(driver_laps['PitOutTime'], race_start))
+        pit_in = pit_in[~np.isnan(pit_in)]
+        pit_out = pit_out[~np.isnan(pit_out)]
+        
+        exit_idx = np.searchsorted(pit_out, pit_in, side='right')
+        exits = np.full(len(pit_in), np.inf)
+        has_exit = exit_idx < len(pit_out)
+        exits[has_exit] = pit_out[exit_idx[has_exit]]
+        pits = {
+            'in': pit_in,
+            'out': exits,  # inf when the driver never left the pits
+        }
+        
+        # Only index drivers whose laps were fully parsed
+        self.laps[driver] = laps
+        self.stints[driver] = stints
+        self.positions[driver] = positions
+        self.pits[driver] = pits
+    
+    def at(self, driver: str, t: float) -> Optional[Dict[str, Any]]:
+        """
+        Look up tyre, position and pit status for one driver at one time.
+        
+        Args:
+            driver: Driver number
+            t: Seconds from race start
+        
+        Returns:
+            Dictionary with compound, tyre_age, in_pit and position, or None
+            if the driver has no laps
+        """
+        driver = str(driver)
+        if driver not in self.laps:
+            return None
+        
+        laps = self.laps[driver]
+        stints = self.stints[driver]
+        pits = self.pits[driver]
+        positions = self.positions[driver]
+        
+        lap_idx = bisect.bisect_right(laps['start'], t) - 1
+        stint_idx = bisect.bisect_right(stints['start'], t) - 1
+        pit_idx = bisect.bisect_right(pits['in'], t) - 1
+        pos_idx = bisect.bisect_right(positions['start'], t) - 1
+        
+        code = int(stints['compound'][stint_idx]) if stint_idx >= 0 else -1
+        return {
+            'compound': TYRE_COMPOUNDS[code] if code >= 0 else None,
+            'tyre_age': int(laps['tyre_life'][lap_idx]) if lap_idx >= 0 else -1,
+            'in_pit': bool(pit_idx >= 0 and t < pits['out'][pit_idx]),
+            'position': int(positions['position'][pos_idx]) if pos_idx >= 0 else -1,
+        }
+    
+    def frame_arrays(self, driver: str, timeline: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Resolve tyre, position and pit status for every timeline frame.
+        
+        Args:
+            driver: Driver number
+            timeline: Timeline array in seconds
+        
+        Returns:
+            Dictionary of per-frame arrays (compound codes, tyre age in
+            laps, in_pit flags, running position); empty if the driver
+            has no laps
+        """
+        driver = str(driver)
+        if driver not in self.laps:
+            return {}
+        
+        laps = self.laps[driver]
+        stints = self.stints[driver]
+        pits = self.pits[driver]
+        positions = self.positions[driver]
+        
+        lap_idx = np.searchsorted(laps['start'], timeline, side='right') - 1
+        stint_idx = np.searchsorted(stints['start'], timeline, side='right') - 1
+        pit_idx = np.searchsorted(pits['in'], timeline, side='right') - 1
+        pos_idx = np.searchsorted(positions['start'], timeline, side='right') - 1
+        
+        compound = np.full(len(timeline), -1, dtype=np.int8)
+        has_stint = stint_idx >= 0
+        compound[has_stint] = stints['compound'][stint_idx[has_stint]]
+        
+        tyre_age = np.full(len(timeline), -1, dtype=np.int16)
+        has_lap = lap_idx >= 0
+        tyre_age[has_lap] = laps['tyre_life'][lap_idx[has_lap]]
+        
+        in_pit = np.zeros(len(timeline), dtype=np.int8)
+        has_pit = pit_idx >= 0
+        in_pit[has_pit] = timeline[has_pit] < pits['out'][pit_idx[has_pit]]
+        
+        position = np.full(len(timeline), -1, dtype=np.int8)
+        has_position = pos_idx >= 0
+        position[has_position] = positions['position'][pos_idx[has_position]]
+        
+        return {
+            'compound': compound,
+            'tyre_age': tyre_age,
+            'in_pit': in_pit,
+            'position': position,
+        }
+    
+    def lap_ends(self) -> Dict[str, np.ndarray]:
+        """Sorted lap completion times in seconds from race start per driver."""
+        return {driver: positions['start'] for driver, positions in self.positions.items()}
+    
+    def last_lap_end(self, driver: str) -> Optional[float]:
+        """Seconds from race start at which the driver completed their last lap."""
+        positions = self.positions.get(str(driver))
+        if positions is None or len(positions['start']) == 0:
+            return None
+        return float(positions['start'][-1])
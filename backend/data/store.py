@@ -0,0 +1,238 @@
+"""Shared on-disk store of processed races, readable by every worker process."""
+
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from backend.utils.constants import (
+    PROCESSED_CACHE_DIR,
+    STORE_VERSION,
+    TELEMETRY_CHANNELS,
+    INTEGER_CHANNELS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessedRaceStore:
+    """
+    Stores processed races as .npy files that workers memory-map read-only.
+    
+    Each race lives in its own directory: meta.json for the format version,
+    session, driver and track info, timeline.npy, and one (drivers x frames)
+    array per telemetry channel. Races stored with another STORE_VERSION are
+    treated as missing and rebuilt. A per-race lock file ensures only one
+    process builds a race; the others wait and then map the finished files.
+    """
+    
+    def __init__(self, root: str = PROCESSED_CACHE_DIR):
+        """Initialize the store under the given directory."""
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+    
+    def _race_dir(self, key: str) -> Path:
+        """Directory holding a race's files."""
+        return self.root / re.sub(r'[^\w.-]', '_', key)
+    
+    @contextmanager
+    def _build_lock(self, key: str):
+        """Hold an exclusive cross-process lock for building a race."""
+        lock_path = self._race_dir(key).with_suffix('.lock')
+        with open(lock_path, 'a+b') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                while True:
+                    # LK_LOCK gives up after 10 one-second retries, far
+                    # shorter than a race build
+                    try:
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a stored race with its arrays memory-mapped read-only.
+        
+        Args:
+            key: Race cache key
+        
+        Returns:
+            Race data in the same shape as the race-data endpoint, or None
+            if the race has not been stored or was stored in another format
+            version
+        """
+        race_dir = self._race_dir(key)
+        meta_path = race_dir / 'meta.json'
+        if not meta_path.exists():
+            return None
+        
+        with open(meta_path) as f:
+            meta = json.load(f)
+        
+        if meta.get('version') != STORE_VERSION:
+            logger.info(f"Stored race {key} has format version {meta.get('version')}, rebuilding")
+            return None
+        
+        timeline = np.load(race_dir / 'timeline.npy', mmap_mode='r')
+        channels = {
+            channel: np.load(race_dir / f'{channel}.npy', mmap_mode='r')
+            for channel in TELEMETRY_CHANNELS
+            if (race_dir / f'{channel}.npy').exists()
+        }
+        
+        drivers = {}
+        for row, driver in enumerate(meta['drivers']):
+            telemetry = {'time': timeline}
+            for channel in driver['channels']:
+                telemetry[channel] = channels[channel][row]
+            
+            drivers[driver['number']] = {
+                'abbreviation': driver['abbreviation'],
+                'full_name': driver['full_name'],
+                'team': driver['team'],
+                'team_color': driver['team_color'],
+                'telemetry': telemetry,
+            }
+        
+        return {
+            'session': meta['session'],
+            'drivers_info': meta['drivers_info'],
+            'track': meta['track'],
+            'race_data': {
+                'timeline': timeline,
+                'drivers': drivers,
+                'events': meta.get('events', []),
+                'total_frames': meta['total_frames'],
+                'duration': meta['duration'],
+            },
+        }
+    
+    def save(self, key: str, result: Dict[str, Any]):
+        """
+        Write a processed race to the store.
+        
+        Files are written to a temporary directory and renamed into place,
+        so readers never see a partially written race.
+        
+        Args:
+            key: Race cache key
+            result: Race data as built by the race-data endpoint
+        """
+        race_data = result['race_data']
+        timeline = np.asarray(race_data['timeline'], dtype=np.float64)
+        numbers = list(race_data['drivers'].keys())
+        
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.root, prefix='.building-'))
+        try:
+            np.save(tmp_dir / 'timeline.npy', timeline)
+            
+            driver_meta = []
+            for number in numbers:
+                driver = race_data['drivers'][number]
+                driver_meta.append({
+                    'number': number,
+                    'abbreviation': driver['abbreviation'],
+                    'full_name': driver['full_name'],
+                    'team': driver['team'],
+                    'team_color': driver['team_color'],
+                    'channels': [c for c in TELEMETRY_CHANNELS if c in driver['telemetry']],
+                })
+            
+            for channel in TELEMETRY_CHANNELS:
+                is_int = channel in INTEGER_CHANNELS
+                data = np.full(
+                    (len(numbers), len(timeline)),
+                    0 if is_int else np.nan,
+                    dtype=np.int16 if is_int else np.float32
+                )
+                for row, number in enumerate(numbers):
+                    telemetry = race_data['drivers'][number]['telemetry']
+                    if channel in telemetry:
+                        values = np.asarray(telemetry[channel])[:len(timeline)]
+                        data[row, :len(values)] = values
+                np.save(tmp_dir / f'{channel}.npy', data)
+            
+            meta = {
+                'version': STORE_VERSION,
+                'session': result['session'],
+                'drivers_info': result['drivers_info'],
+                'track': result['track'],
+                'drivers': driver_meta,
+                'events': race_data.get('events', []),
+                'total_frames': race_data['total_frames'],
+                'duration': race_data['duration'],
+            }
+            with open(tmp_dir / 'meta.json', 'w') as f:
+                json.dump(meta, f)
+            
+            race_dir = self._race_dir(key)
+            if race_dir.exists():
+                shutil.rmtree(race_dir)
+            os.rename(tmp_dir, race_dir)
+            logger.info(f"Stored processed race {key} at {race_dir}")
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+    
+    def get_or_build(
+        self,
+        key: str,
+        build: Callable[[], Optional[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a race from the store, building it first if needed.
+        
+        Only one process runs build for a given key; concurrent callers
+        block on the lock and then load what it stored. Results without
+        race data are returned but not stored.
+        
+        Args:
+            key: Race cache key
+            build: Callable returning processed race data, or None
+        
+        Returns:
+            Race data, or None if build returned None
+        """
+        stored = self.load(key)
+        if stored is not None:
+            return stored
+        
+        with self._build_lock(key):
+            # Another worker may have finished while we waited
+            stored = self.load(key)
+            if stored is not None:
+                logger.info(f"Loaded {key} built by another worker")
+                return stored
+            
+            result = build()
+            if not result or not result.get('race_data'):
+                return result
+            
+            self.save(key, result)
+        
+        return self.load(key)
@@ -1,5 +1,7 @@
 """Configuration constants for the F1 Race Replay application."""
 
+import os
+
 # Application settings
 APP_NAME = "F1 Race Replay"
 APP_VERSION = "1.0.0"
@@ -7,10 +9,19 @@ APP_VERSION = "1.0.0"
 # Server settings
 HOST = "0.0.0.0"
 PORT = 8000
+WORKERS = 1  # worker processes in production mode
 
 # Cache settings
 CACHE_DIR = "cache"
 CACHE_ENABLED = True
+PROCESSED_CACHE_DIR = "cache/processed"  # shared across worker processes
+STORE_VERSION = 3  # bump whenever the stored channels or race metadata change
+SESSION_CACHE_SIZE = 2  # loaded FastF1 sessions kept in memory per process
+SESSION_CACHE_TTL = 600  # seconds before an unused loaded session is dropped
+
+# Races preloaded at startup, e.g. "2024:Monaco:R,2024:Silverstone:R".
+# Read from the environment so every worker process sees the same list.
+WARM_RACES = os.environ.get("F1_WARM_RACES", "")
 
 # Playback settings
 DEFAULT_FPS = 60
@@ -21,6 +32,22 @@ DEFAULT_SPEED = 1.0
 TELEMETRY_FREQUENCY = 10  # Hz
 INTERPOLATION_METHOD = "linear"
 
+# Race event settings
+EVENT_TYPES = ["overtake", "pit_entry", "pit_exit", "drs_activation", "retirement"]
+DRS_OPEN_THRESHOLD = 10  # FastF1 DRS values of 10 and above mean the flap is open
+
+# Live feed ingestion settings
+LIVE_FEED_DIR = "feeds"  # recorded feeds are <name>.jsonl files in here
+INGEST_POLL_INTERVAL = 0.1  # seconds between feed file polls
+INGEST_DELAY = 0.5  # seconds frames trail the newest sample, so interpolation has data on both sides
+INGEST_BATCH_LINES = 500  # feed lines parsed per batch
+INGEST_READ_SIZE = 64 * 1024  # bytes read from the feed file at a time
+INGEST_UPDATE_BUDGET = 0.05  # seconds of parsing per poll, kept under INGEST_POLL_INTERVAL
+
+# Lap comparison settings
+COMPARISON_DISTANCE_STEP = 5.0  # meters between resampled points
+LAP_TRACE_CACHE_SIZE = 256  # resampled lap traces kept in memory
+
 # Track rendering
 TRACK_SCALE_FACTOR = 1.0
 TRACK_MARGIN = 50  # pixels
@@ -36,3 +63,16 @@ TELEMETRY_UPDATE_INTERVAL = 100  # ms
 # WebSocket settings
 WS_HEARTBEAT_INTERVAL = 30  # seconds
 WS_MESSAGE_QUEUE_SIZE = 100
+
+# Tyre compounds, indexed by the compound code streamed per frame (-1 = unknown)
+TYRE_COMPOUNDS = ["SOFT", "MEDIUM", "HARD", "INTERMEDIATE", "WET"]
+
+# Replay stream channels
+TELEMETRY_CHANNELS = ["x", "y", "speed", "gear", "drs", "compound", "tyre_age", "in_pit", "position"]
+INTEGER_CHANNELS = ["gear", "drs", "compound", "tyre_age", "in_pit", "position"]
+FRAME_ENCODINGS = ["json", "binary"]
+
+# Adaptive frame rate settings
+WS_MIN_FPS = 1  # lowest frame rate a slow client is throttled to
+WS_SEND_BUDGET = 0.5  # max fraction of the frame interval a send may take
+WS_SEND_SMOOTHING = 0.2  # EWMA weight for send time measurements
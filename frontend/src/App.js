@@ -17,7 +17,7 @@ function App() {
   const [selectedDriver, setSelectedDriver] = useState(null);
 
   const { raceData, loading, error, loadRace } = useRaceData();
-  const { frameData, connect, disconnect, isConnected } = useWebSocket();
+  const { frameData, frameBuffer, liveOrder, connect, disconnect, isConnected, subscribe } = useWebSocket();
 
   useEffect(() => {
     if (selectedRace) {
@@ -31,6 +31,16 @@ function App() {
     }
   }, [frameData]);
 
+  useEffect(() => {
+    // Leaderboard fields for everyone, full telemetry for the selected driver
+    if (isConnected) {
+      subscribe({
+        channels: ['x', 'y', 'speed', 'compound', 'in_pit', 'position'],
+        detailDrivers: selectedDriver ? [selectedDriver] : [],
+      });
+    }
+  }, [isConnected, selectedDriver, subscribe]);
+
   const handleRaceSelect = (race) => {
     setSelectedRace(race);
     setIsPlaying(false);
@@ -100,7 +110,8 @@ function App() {
           
           <TrackView 
             trackData={raceData?.track}
-            driversData={frameData?.drivers || {}}
+            frameBuffer={frameBuffer}
+            driversInfo={raceData?.drivers_info || []}
             selectedDriver={selectedDriver}
             onDriverSelect={handleDriverSelect}
           />
@@ -121,6 +132,7 @@ function App() {
             driversInfo={raceData?.drivers_info || []}
             selectedDriver={selectedDriver}
             onDriverSelect={handleDriverSelect}
+            order={liveOrder}
           />
           
           <TelemetryPanel 
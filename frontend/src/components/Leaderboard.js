@@ -1,22 +1,45 @@
 import React from 'react';
 import './Leaderboard.css';
 
-const Leaderboard = ({ drivers, driversInfo, selectedDriver, onDriverSelect }) => {
+// Matches TYRE_COLORS in backend/utils/colors.py
+const TYRE_COLORS = {
+  SOFT: '#FF0000',
+  MEDIUM: '#FFD700',
+  HARD: '#FFFFFF',
+  INTERMEDIATE: '#00FF00',
+  WET: '#0000FF',
+};
+
+const Leaderboard = ({ drivers, driversInfo, selectedDriver, onDriverSelect, order = null }) => {
   // Create leaderboard entries
   const leaderboard = Object.entries(drivers).map(([driverNum, data], index) => {
     const info = driversInfo.find(d => d.number === driverNum) || {};
     return {
-      position: index + 1,
+      position: data.position || index + 1,
       number: driverNum,
       abbreviation: data.abbreviation || info.abbreviation || driverNum,
       team: data.team || info.team || 'Unknown',
       teamColor: data.team_color || info.team_color || '#FFFFFF',
       speed: data.speed || 0,
+      compound: data.compound,
+      inPit: data.in_pit,
     };
   });
 
-  // Sort by position (in real implementation, this would be based on lap times)
-  leaderboard.sort((a, b) => a.position - b.position);
+  if (order) {
+    // Running order from a live feed; drivers not in it yet go last
+    const rank = (number) => {
+      const idx = order.indexOf(number);
+      return idx === -1 ? order.length : idx;
+    };
+    leaderboard.sort((a, b) => rank(a.number) - rank(b.number));
+    leaderboard.forEach((driver, index) => {
+      driver.position = index + 1;
+    });
+  } else {
+    // Sort by running position (falls back to arrival order before lap 1 ends)
+    leaderboard.sort((a, b) => a.position - b.position);
+  }
 
   return (
     <div className="leaderboard">
@@ -37,6 +60,16 @@ const Leaderboard = ({ drivers, driversInfo, selectedDriver, onDriverSelect }) =
               <div className="driver-abbr">{driver.abbreviation}</div>
               <div className="driver-team">{driver.team}</div>
             </div>
+            {driver.compound && (
+              <div
+                className="tyre-compound"
+                style={{ borderColor: TYRE_COLORS[driver.compound] }}
+                title={driver.compound}
+              >
+                {driver.compound[0]}
+              </div>
+            )}
+            {driver.inPit && <div className="pit-status">PIT</div>}
             <div className="driver-speed">
               {driver.speed.toFixed(0)} km/h
             </div>
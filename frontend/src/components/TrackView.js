@@ -1,33 +1,77 @@
 import React, { useRef, useEffect } from 'react';
+import { samplePositions } from '../utils/frameBuffer';
 import './TrackView.css';
 
-const TrackView = ({ trackData, driversData, selectedDriver, onDriverSelect }) => {
+const TrackView = ({ trackData, frameBuffer, driversInfo, selectedDriver, onDriverSelect }) => {
   const canvasRef = useRef(null);
+  const trackLayerRef = useRef(null);
+  const transformRef = useRef(null);
+  const positionsRef = useRef([]);
+  const selectedRef = useRef(selectedDriver);
+  const driversInfoRef = useRef(driversInfo);
+
+  // The render loop reads these through refs so prop changes don't restart it
+  useEffect(() => {
+    selectedRef.current = selectedDriver;
+  }, [selectedDriver]);
+
+  useEffect(() => {
+    driversInfoRef.current = driversInfo;
+  }, [driversInfo]);
 
   useEffect(() => {
     if (!canvasRef.current || !trackData) return;
 
     const canvas = canvasRef.current;
     const ctx = canvas.getContext('2d');
-    
-    // Set canvas size
-    canvas.width = canvas.offsetWidth;
-    canvas.height = canvas.offsetHeight;
+    let animationId = null;
+
+    const render = () => {
+      // Rebuild the static track layer only when the canvas is resized
+      if (
+        !trackLayerRef.current ||
+        canvas.width !== canvas.offsetWidth ||
+        canvas.height !== canvas.offsetHeight
+      ) {
+        canvas.width = canvas.offsetWidth;
+        canvas.height = canvas.offsetHeight;
+        trackLayerRef.current = buildTrackLayer(trackData, canvas.width, canvas.height);
+      }
+
+      ctx.drawImage(trackLayerRef.current, 0, 0);
+
+      if (frameBuffer?.current && transformRef.current) {
+        positionsRef.current = samplePositions(frameBuffer.current);
+        drawDrivers(ctx, positionsRef.current, selectedRef.current);
+      }
+
+      animationId = requestAnimationFrame(render);
+    };
+
+    trackLayerRef.current = null;
+    animationId = requestAnimationFrame(render);
+
+    return () => cancelAnimationFrame(animationId);
+  }, [trackData, frameBuffer]);
+
+  const buildTrackLayer = (track, width, height) => {
+    const layer = document.createElement('canvas');
+    layer.width = width;
+    layer.height = height;
+
+    const ctx = layer.getContext('2d');
 
     // Clear canvas
     ctx.fillStyle = '#0f0f0f';
-    ctx.fillRect(0, 0, canvas.width, canvas.height);
+    ctx.fillRect(0, 0, width, height);
 
     // Draw track
-    if (trackData && trackData.x && trackData.y) {
-      drawTrack(ctx, trackData, canvas.width, canvas.height);
+    if (track && track.x && track.y) {
+      drawTrack(ctx, track, width, height);
     }
 
-    // Draw drivers
-    if (driversData) {
-      drawDrivers(ctx, driversData, trackData, canvas.width, canvas.height, selectedDriver);
-    }
-  }, [trackData, driversData, selectedDriver]);
+    return layer;
+  };
 
   const drawTrack = (ctx, track, width, height) => {
     const x = track.x;
@@ -69,22 +113,21 @@ const TrackView = ({ trackData, driversData, selectedDriver, onDriverSelect }) =
     ctx.stroke();
 
     // Store transform for driver rendering
-    ctx.trackTransform = { minX, minY, scale, margin };
+    transformRef.current = { minX, minY, scale, margin };
   };
 
-  const drawDrivers = (ctx, drivers, track, width, height, selected) => {
-    if (!track || !ctx.trackTransform) return;
-
-    const { minX, minY, scale, margin } = ctx.trackTransform;
+  const drawDrivers = (ctx, positions, selected) => {
+    const { minX, minY, scale, margin } = transformRef.current;
+    const info = driversInfoRef.current || [];
 
-    Object.entries(drivers).forEach(([driverNum, driver]) => {
-      if (!driver.x || !driver.y) return;
+    positions.forEach(({ number, x, y }) => {
+      const driver = info.find(d => d.number === number) || {};
 
-      const px = (driver.x - minX) * scale + margin;
-      const py = (driver.y - minY) * scale + margin;
+      const px = (x - minX) * scale + margin;
+      const py = (y - minY) * scale + margin;
 
       // Draw driver marker
-      const isSelected = driverNum === selected;
+      const isSelected = number === selected;
       const radius = isSelected ? 8 : 6;
 
       // Outer circle (team color)
@@ -112,33 +155,28 @@ const TrackView = ({ trackData, driversData, selectedDriver, onDriverSelect }) =
       ctx.fillStyle = '#FFFFFF';
       ctx.font = 'bold 10px sans-serif';
       ctx.textAlign = 'center';
-      ctx.fillText(driver.abbreviation, px, py - 12);
+      ctx.fillText(driver.abbreviation || number, px, py - 12);
     });
   };
 
   const handleCanvasClick = (e) => {
-    if (!canvasRef.current || !driversData || !trackData) return;
+    if (!canvasRef.current || !transformRef.current) return;
 
     const canvas = canvasRef.current;
     const rect = canvas.getBoundingClientRect();
     const x = e.clientX - rect.left;
     const y = e.clientY - rect.top;
 
-    const ctx = canvas.getContext('2d');
-    if (!ctx.trackTransform) return;
-
-    const { minX, minY, scale, margin } = ctx.trackTransform;
-
-    // Find clicked driver
-    for (const [driverNum, driver] of Object.entries(driversData)) {
-      if (!driver.x || !driver.y) continue;
+    const { minX, minY, scale, margin } = transformRef.current;
 
+    // Find clicked driver at its last rendered position
+    for (const driver of positionsRef.current) {
       const px = (driver.x - minX) * scale + margin;
       const py = (driver.y - minY) * scale + margin;
 
       const distance = Math.sqrt((x - px) ** 2 + (y - py) ** 2);
       if (distance < 15) {
-        onDriverSelect(driverNum);
+        onDriverSelect(driver.number);
         break;
       }
     }
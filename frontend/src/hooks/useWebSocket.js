@@ -1,21 +1,59 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
+import { createFrameBuffer, pushFrame, clearFrameBuffer, frameToSnapshot } from '../utils/frameBuffer';
 
 const WS_BASE_URL = process.env.REACT_APP_WS_URL || 'ws://localhost:8000';
 
+// How often decoded frames are published to React state. Canvas rendering
+// reads frameBuffer directly every animation frame and is not throttled.
+const SNAPSHOT_INTERVAL_MS = 250;
+
 export const useWebSocket = () => {
   const [frameData, setFrameData] = useState(null);
   const [isConnected, setIsConnected] = useState(false);
   const [error, setError] = useState(null);
+  // Running order pushed by a followed live feed, null otherwise
+  const [liveOrder, setLiveOrder] = useState(null);
   const wsRef = useRef(null);
+  const workerRef = useRef(null);
+  const frameBuffer = useRef(createFrameBuffer());
+  const lastSnapshotRef = useRef(0);
   const clientIdRef = useRef(`client_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`);
 
+  const handleDecoded = useCallback((data) => {
+    if (data.type === 'frame') {
+      pushFrame(frameBuffer.current, data.frame);
+
+      const now = performance.now();
+      if (now - lastSnapshotRef.current >= SNAPSHOT_INTERVAL_MS) {
+        lastSnapshotRef.current = now;
+        setFrameData(frameToSnapshot(data.frame));
+      }
+    } else if (data.type === 'live_leaderboard') {
+      setLiveOrder(data.order);
+    } else if (data.type === 'error') {
+      setError(data.message);
+    } else if (data.type === 'decode_error') {
+      console.error('Error decoding WebSocket message:', data.message);
+    } else if (data.type === 'replay_complete') {
+      console.log('Replay completed');
+    }
+  }, []);
+
   const connect = useCallback(() => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
       return;
     }
 
     try {
+      if (!workerRef.current) {
+        workerRef.current = new Worker(
+          new URL('../workers/frameDecoder.worker.js', import.meta.url)
+        );
+        workerRef.current.onmessage = (event) => handleDecoded(event.data);
+      }
+
       const ws = new WebSocket(`${WS_BASE_URL}/ws/replay/${clientIdRef.current}`);
+      ws.binaryType = 'arraybuffer';
 
       ws.onopen = () => {
         console.log('WebSocket connected');
@@ -24,18 +62,11 @@ export const useWebSocket = () => {
       };
 
       ws.onmessage = (event) => {
-        try {
-          const data = JSON.parse(event.data);
-          
-          if (data.type === 'frame') {
-            setFrameData(data);
-          } else if (data.type === 'error') {
-            setError(data.message);
-          } else if (data.type === 'replay_complete') {
-            console.log('Replay completed');
-          }
-        } catch (err) {
-          console.error('Error parsing WebSocket message:', err);
+        // Hand raw payloads to the worker; binary frames are transferred
+        if (event.data instanceof ArrayBuffer) {
+          workerRef.current.postMessage(event.data, [event.data]);
+        } else {
+          workerRef.current.postMessage(event.data);
         }
       };
 
@@ -54,13 +85,18 @@ export const useWebSocket = () => {
       console.error('Error creating WebSocket:', err);
       setError('Failed to create WebSocket connection');
     }
-  }, []);
+  }, [handleDecoded]);
 
   const disconnect = useCallback(() => {
     if (wsRef.current) {
       wsRef.current.close();
       wsRef.current = null;
     }
+    if (workerRef.current) {
+      workerRef.current.terminate();
+      workerRef.current = null;
+    }
+    clearFrameBuffer(frameBuffer.current);
   }, []);
 
   const sendMessage = useCallback((message) => {
@@ -72,6 +108,8 @@ export const useWebSocket = () => {
   }, []);
 
   const startReplay = useCallback((raceData, playbackSpeed = 1.0) => {
+    clearFrameBuffer(frameBuffer.current);
+    setLiveOrder(null);
     sendMessage({
       type: 'start_replay',
       race_data: raceData,
@@ -85,6 +123,42 @@ export const useWebSocket = () => {
     });
   }, [sendMessage]);
 
+  const seek = useCallback((frameIndex) => {
+    // Don't interpolate cars from their pre-seek positions
+    clearFrameBuffer(frameBuffer.current);
+    sendMessage({
+      type: 'seek',
+      frame_index: frameIndex,
+    });
+  }, [sendMessage]);
+
+  const followLive = useCallback((feed) => {
+    clearFrameBuffer(frameBuffer.current);
+    setLiveOrder(null);
+    sendMessage({
+      type: 'follow_live',
+      feed,
+    });
+  }, [sendMessage]);
+
+  const unfollowLive = useCallback(() => {
+    setLiveOrder(null);
+    sendMessage({
+      type: 'unfollow_live',
+    });
+  }, [sendMessage]);
+
+  // Fields left undefined are omitted and keep their current server-side value
+  const subscribe = useCallback(({ drivers, channels, detailDrivers, encoding = 'binary' } = {}) => {
+    sendMessage({
+      type: 'subscribe',
+      drivers,
+      channels,
+      detail_drivers: detailDrivers,
+      encoding,
+    });
+  }, [sendMessage]);
+
   useEffect(() => {
     return () => {
       disconnect();
@@ -93,6 +167,8 @@ export const useWebSocket = () => {
 
   return {
     frameData,
+    frameBuffer,
+    liveOrder,
     isConnected,
     error,
     connect,
@@ -100,5 +176,9 @@ export const useWebSocket = () => {
     sendMessage,
     startReplay,
     stopReplay,
+    seek,
+    followLive,
+    unfollowLive,
+    subscribe,
   };
 };
@@ -0,0 +1,80 @@
+// Must match TYRE_COMPOUNDS in backend/utils/constants.py
+export const TYRE_COMPOUNDS = ['SOFT', 'MEDIUM', 'HARD', 'INTERMEDIATE', 'WET'];
+
+// Holds the two most recent decoded frames so renderers can interpolate
+// between them at display rate, independent of the server frame rate.
+
+export const createFrameBuffer = () => ({
+  prev: null,
+  curr: null,
+});
+
+export const pushFrame = (buffer, frame, receivedAt = performance.now()) => {
+  frame.receivedAt = receivedAt;
+  frame.indexByNumber = new Map(frame.numbers.map((num, i) => [num, i]));
+  buffer.prev = buffer.curr;
+  buffer.curr = frame;
+};
+
+export const clearFrameBuffer = (buffer) => {
+  buffer.prev = null;
+  buffer.curr = null;
+};
+
+// Positions are rendered one frame behind: over the gap between the last two
+// frames we move from prev to curr, so motion stays smooth at any frame rate.
+export const samplePositions = (buffer, now = performance.now()) => {
+  const { prev, curr } = buffer;
+  if (!curr) return [];
+
+  let alpha = 1;
+  if (prev) {
+    const gap = curr.receivedAt - prev.receivedAt;
+    alpha = gap > 0 ? Math.min(Math.max((now - curr.receivedAt) / gap, 0), 1) : 1;
+  }
+
+  const positions = [];
+  for (let i = 0; i < curr.numbers.length; i++) {
+    const number = curr.numbers[i];
+    let x = curr.x[i];
+    let y = curr.y[i];
+
+    const j = prev ? prev.indexByNumber.get(number) : undefined;
+    if (j !== undefined && !Number.isNaN(prev.x[j]) && !Number.isNaN(prev.y[j])) {
+      x = prev.x[j] + (x - prev.x[j]) * alpha;
+      y = prev.y[j] + (y - prev.y[j]) * alpha;
+    }
+
+    if (!Number.isNaN(x) && !Number.isNaN(y)) {
+      positions.push({ number, x, y });
+    }
+  }
+
+  return positions;
+};
+
+// Plain object snapshot in the shape the panels consume. Driver metadata is
+// not part of decoded frames; panels take it from the session's drivers_info.
+export const frameToSnapshot = (frame) => {
+  const drivers = {};
+
+  frame.numbers.forEach((number, i) => {
+    drivers[number] = {
+      x: Number.isNaN(frame.x[i]) ? undefined : frame.x[i],
+      y: Number.isNaN(frame.y[i]) ? undefined : frame.y[i],
+      speed: Number.isNaN(frame.speed[i]) ? undefined : frame.speed[i],
+      gear: frame.gear[i] < 0 ? undefined : frame.gear[i],
+      drs: frame.drs[i] < 0 ? undefined : frame.drs[i],
+      compound: TYRE_COMPOUNDS[frame.compound[i]],
+      tyre_age: frame.tyreAge[i] < 0 ? undefined : frame.tyreAge[i],
+      in_pit: frame.inPit[i] < 0 ? undefined : frame.inPit[i] === 1,
+      position: frame.position[i] < 1 ? undefined : frame.position[i],
+    };
+  });
+
+  return {
+    frame_index: frame.frameIndex,
+    time: frame.time,
+    drivers,
+  };
+};
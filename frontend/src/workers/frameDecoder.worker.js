@@ -0,0 +1,99 @@
+/* eslint-disable no-restricted-globals */
+
+// Decodes replay messages off the main thread. Frames are unpacked into
+// typed arrays (one slot per driver) and transferred back without copying.
+
+// Must match FRAME_HEADER / DRIVER_RECORD in backend/api/websocket.py
+const HEADER_SIZE = 14;
+const RECORD_SIZE = 21;
+
+const allocateFrame = (frameIndex, time, count) => ({
+  frameIndex,
+  time,
+  numbers: new Array(count),
+  x: new Float32Array(count),
+  y: new Float32Array(count),
+  speed: new Float32Array(count),
+  gear: new Int8Array(count),
+  drs: new Int8Array(count),
+  compound: new Int8Array(count),
+  tyreAge: new Int16Array(count),
+  inPit: new Int8Array(count),
+  position: new Int8Array(count),
+});
+
+const decodeBinaryFrame = (buffer) => {
+  const view = new DataView(buffer);
+  const count = view.getUint16(12, true);
+  const frame = allocateFrame(view.getUint32(0, true), view.getFloat64(4, true), count);
+
+  for (let i = 0; i < count; i++) {
+    const offset = HEADER_SIZE + i * RECORD_SIZE;
+    frame.numbers[i] = String(view.getUint16(offset, true));
+    frame.x[i] = view.getFloat32(offset + 2, true);
+    frame.y[i] = view.getFloat32(offset + 6, true);
+    frame.speed[i] = view.getFloat32(offset + 10, true);
+    frame.gear[i] = view.getInt8(offset + 14);
+    frame.drs[i] = view.getInt8(offset + 15);
+    frame.compound[i] = view.getInt8(offset + 16);
+    frame.tyreAge[i] = view.getInt16(offset + 17, true);
+    frame.inPit[i] = view.getInt8(offset + 19);
+    frame.position[i] = view.getInt8(offset + 20);
+  }
+
+  return frame;
+};
+
+const decodeJsonFrame = (data) => {
+  const entries = Object.entries(data.drivers || {});
+  const frame = allocateFrame(data.frame_index, data.time, entries.length);
+
+  entries.forEach(([driverNum, driver], i) => {
+    frame.numbers[i] = driverNum;
+    frame.x[i] = driver.x ?? NaN;
+    frame.y[i] = driver.y ?? NaN;
+    frame.speed[i] = driver.speed ?? NaN;
+    frame.gear[i] = driver.gear ?? -1;
+    frame.drs[i] = driver.drs ?? -1;
+    frame.compound[i] = driver.compound ?? -1;
+    frame.tyreAge[i] = driver.tyre_age ?? -1;
+    frame.inPit[i] = driver.in_pit ?? -1;
+    frame.position[i] = driver.position ?? -1;
+  });
+
+  return frame;
+};
+
+const postFrame = (frame) => {
+  self.postMessage({ type: 'frame', frame }, [
+    frame.x.buffer,
+    frame.y.buffer,
+    frame.speed.buffer,
+    frame.gear.buffer,
+    frame.drs.buffer,
+    frame.compound.buffer,
+    frame.tyreAge.buffer,
+    frame.inPit.buffer,
+    frame.position.buffer,
+  ]);
+};
+
+self.onmessage = (event) => {
+  const payload = event.data;
+
+  try {
+    if (payload instanceof ArrayBuffer) {
+      postFrame(decodeBinaryFrame(payload));
+      return;
+    }
+
+    const data = JSON.parse(payload);
+    if (data.type === 'frame') {
+      postFrame(decodeJsonFrame(data));
+    } else {
+      self.postMessage(data);
+    }
+  } catch (err) {
+    self.postMessage({ type: 'decode_error', message: err.message });
+  }
+};
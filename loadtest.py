@@ -0,0 +1,399 @@
+"""Load-testing harness for the race replay WebSocket server.
+
+Opens N simulated /ws/replay/{client_id} clients against a running server
+(or one started in-process) and reports sustained frames/sec, per-frame
+lateness against the intended replay schedule, server CPU and memory, and
+the client count at which the server saturates.
+
+Examples:
+    python loadtest.py --in-process --clients 1,5,10,25,50
+    python loadtest.py --url ws://localhost:8000 --server-pid 1234 --race 2024:Monaco:R
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import urllib.request
+import uuid
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import websockets
+
+from backend.api.websocket import FRAME_HEADER
+from backend.utils.constants import PORT, TELEMETRY_FREQUENCY
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger("loadtest")
+
+# A step counts as saturated when clients get less than this share of the
+# intended frame rate, or p95 lateness exceeds the threshold below
+SATURATION_FPS_RATIO = 0.9
+SATURATION_LATENESS = 0.25  # seconds
+
+
+def synthetic_race_data(num_frames: int, num_drivers: int) -> Dict[str, Any]:
+    """
+    Build race data in the shape of /api/race-data without loading FastF1.
+
+    Args:
+        num_frames: Timeline length
+        num_drivers: Number of drivers
+
+    Returns:
+        Race data suitable for a start_replay message
+    """
+    rng = np.random.default_rng(0)
+    timeline = np.arange(num_frames) / TELEMETRY_FREQUENCY
+    drivers = {}
+
+    for i in range(num_drivers):
+        angle = np.linspace(0, 20 * np.pi, num_frames) + i * 0.1
+        drivers[str(i + 1)] = {
+            'abbreviation': f"D{i + 1:02d}",
+            'team': 'Synthetic',
+            'team_color': '#FFFFFF',
+            'telemetry': {
+                'time': timeline.tolist(),
+                'x': (5000 * np.cos(angle)).tolist(),
+                'y': (3000 * np.sin(angle)).tolist(),
+                'speed': rng.uniform(80, 330, num_frames).round(1).tolist(),
+                'gear': rng.integers(1, 9, num_frames).tolist(),
+                'drs': rng.choice([0, 8, 12], num_frames).tolist(),
+            },
+        }
+
+    return {
+        'race_data': {
+            'timeline': timeline.tolist(),
+            'drivers': drivers,
+            'total_frames': num_frames,
+            'duration': float(timeline[-1]),
+        }
+    }
+
+
+def fetch_race_data(http_url: str, race: str) -> Dict[str, Any]:
+    """
+    Fetch processed race data from a running server.
+
+    Args:
+        http_url: Server base URL, e.g. http://localhost:8000
+        race: Race as YEAR:GP[:SESSION]
+
+    Returns:
+        Race data from /api/race-data
+    """
+    parts = race.split(':')
+    session_type = parts[2] if len(parts) > 2 else "R"
+    url = f"{http_url}/api/race-data/{parts[0]}/{urllib.request.quote(parts[1])}/{session_type}"
+    logger.info(f"Fetching {url}")
+    with urllib.request.urlopen(url) as response:
+        return json.load(response)
+
+
+class ResourceSampler:
+    """Samples CPU and resident memory of a process in a background thread."""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        """Initialize a sampler for the given process id."""
+        self.pid = pid
+        self.interval = interval
+        self.cpu: List[float] = []
+        self.rss: List[float] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _read_proc(self):
+        """CPU seconds and RSS bytes from /proc (Linux fallback without psutil)."""
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        rss_bytes = int(fields[21]) * os.sysconf('SC_PAGE_SIZE')
+        return cpu_seconds, rss_bytes
+
+    def _run(self):
+        process = psutil.Process(self.pid) if psutil else None
+        last_cpu = None
+        last_time = time.monotonic()
+
+        while not self._stop.wait(self.interval):
+            if process is not None:
+                times = process.cpu_times()
+                cpu_seconds = times.user + times.system
+                rss_bytes = process.memory_info().rss
+            else:
+                cpu_seconds, rss_bytes = self._read_proc()
+
+            now = time.monotonic()
+            if last_cpu is not None:
+                self.cpu.append(100 * (cpu_seconds - last_cpu) / (now - last_time))
+            last_cpu, last_time = cpu_seconds, now
+            self.rss.append(rss_bytes / 2**20)
+
+    def start(self):
+        """Start sampling."""
+        if psutil is None and not os.path.exists(f"/proc/{self.pid}/stat"):
+            logger.warning("psutil not installed and /proc unavailable; CPU/memory not reported")
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Dict[str, Optional[float]]:
+        """Stop sampling and summarize."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return {
+            'cpu_percent_mean': float(np.mean(self.cpu)) if self.cpu else None,
+            'cpu_percent_max': float(np.max(self.cpu)) if self.cpu else None,
+            'rss_mb_max': float(np.max(self.rss)) if self.rss else None,
+        }
+
+
+async def run_client(
+    ws_url: str,
+    race_data: Dict[str, Any],
+    playback_speed: float,
+    encoding: str,
+    duration: float
+) -> Dict[str, Any]:
+    """
+    Run one simulated replay client for duration seconds after its first frame.
+
+    Returns:
+        Receive times and frame indices of every frame, bytes received and
+        whether the server throttled this client
+    """
+    client_id = f"loadtest_{uuid.uuid4().hex[:8]}"
+    result = {'received': [], 'frames': [], 'bytes': 0, 'throttled': False}
+
+    async with websockets.connect(f"{ws_url}/ws/replay/{client_id}", max_size=None) as ws:
+        await ws.send(json.dumps({'type': 'subscribe', 'encoding': encoding}))
+        await ws.send(json.dumps({
+            'type': 'start_replay',
+            'race_data': race_data,
+            'playback_speed': playback_speed,
+        }))
+
+        deadline = None
+        while True:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
+            try:
+                message = await asyncio.wait_for(ws.recv(), timeout=timeout)
+            except asyncio.TimeoutError:
+                break
+            received_at = time.monotonic()
+
+            if isinstance(message, bytes):
+                frame_index = FRAME_HEADER.unpack_from(message)[0]
+            else:
+                data = json.loads(message)
+                if data.get('type') == 'frame_rate':
+                    result['throttled'] = True
+                if data.get('type') == 'replay_complete':
+                    break
+                if data.get('type') != 'frame':
+                    continue
+                frame_index = data['frame_index']
+
+            # Measure from the first frame so connection setup isn't counted
+            if deadline is None:
+                deadline = received_at + duration
+            result['received'].append(received_at)
+            result['frames'].append(frame_index)
+            result['bytes'] += len(message)
+
+    return result
+
+
+async def run_step(
+    ws_url: str,
+    num_clients: int,
+    race_data: Dict[str, Any],
+    playback_speed: float,
+    encoding: str,
+    duration: float,
+    warmup: float,
+    server_pid: Optional[int]
+) -> Dict[str, Any]:
+    """
+    Run num_clients concurrent clients for warmup + duration seconds.
+
+    Frames received during each client's first warmup seconds (replay
+    start-up, when every client uploads its race data) are not measured.
+
+    Lateness of a frame is how much later it arrived than the intended
+    schedule, which is anchored at the client's best-case (earliest
+    relative) frame: frame i is due (i - i0) / (TELEMETRY_FREQUENCY * speed)
+    seconds after frame i0.
+
+    Returns:
+        Aggregate throughput, lateness percentiles and resource usage
+    """
+    interval = 1.0 / (TELEMETRY_FREQUENCY * playback_speed)
+    sampler = ResourceSampler(server_pid) if server_pid else None
+    if sampler:
+        sampler.start()
+
+    outcomes = await asyncio.gather(*[
+        run_client(ws_url, race_data, playback_speed, encoding, warmup + duration)
+        for _ in range(num_clients)
+    ], return_exceptions=True)
+
+    errors = [o for o in outcomes if isinstance(o, Exception)]
+    for error in errors[:3]:
+        logger.error(f"Client failed: {error!r}")
+
+    clients = [o for o in outcomes if not isinstance(o, Exception) and len(o['frames']) > 1]
+    fps = 0.0
+    mbit = 0.0
+    lateness = []
+    for client in clients:
+        received = np.array(client['received'])
+        measured = received >= received[0] + warmup
+        if measured.sum() < 2:
+            continue
+        received = received[measured]
+        offsets = received - np.array(client['frames'])[measured] * interval
+        lateness.append(offsets - offsets.min())
+        window = received[-1] - received[0]
+        fps += (len(received) - 1) / window
+        mbit += client['bytes'] * measured.mean() * 8 / window / 1e6
+
+    lateness = np.concatenate(lateness) if lateness else np.zeros(1)
+    intended_fps = num_clients * TELEMETRY_FREQUENCY * playback_speed
+    p95 = float(np.percentile(lateness, 95))
+
+    step = {
+        'clients': num_clients,
+        'errors': len(errors),
+        'frames_per_sec': fps,
+        'intended_frames_per_sec': intended_fps,
+        'mbit_per_sec': mbit,
+        'throttled_clients': sum(client['throttled'] for client in clients),
+        'lateness_p50_ms': 1000 * float(np.percentile(lateness, 50)),
+        'lateness_p95_ms': 1000 * p95,
+        'lateness_p99_ms': 1000 * float(np.percentile(lateness, 99)),
+        'lateness_max_ms': 1000 * float(lateness.max()),
+    }
+    step['saturated'] = bool(
+        errors
+        or fps < SATURATION_FPS_RATIO * intended_fps
+        or p95 > SATURATION_LATENESS
+    )
+    if sampler:
+        step.update(sampler.stop())
+    return step
+
+
+def start_in_process_server(port: int):
+    """Start the app with uvicorn in a background thread."""
+    import uvicorn
+    from main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _format(value: Optional[float], fmt: str = "{:.1f}") -> str:
+    return "n/a" if value is None else fmt.format(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the replay WebSocket server")
+    parser.add_argument("--url", default=f"ws://localhost:{PORT}", help="Server WebSocket base URL")
+    parser.add_argument("--in-process", action="store_true", help="Start the app in this process on a free port")
+    parser.add_argument("--server-pid", type=int, help="PID of the server, for CPU/memory sampling")
+    parser.add_argument("--clients", default="1,5,10,25,50", help="Comma-separated client counts to ramp through")
+    parser.add_argument("--speeds", default="1", help="Comma-separated playback speeds")
+    parser.add_argument("--race", help="Replay a real race as YEAR:GP[:SESSION] (fetched from the server)")
+    parser.add_argument("--frames", type=int, default=3000, help="Synthetic race length in frames")
+    parser.add_argument("--drivers", type=int, default=20, help="Synthetic race driver count")
+    parser.add_argument("--encoding", choices=["json", "binary"], default="json")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per step")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds at the start of each step")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    ws_url = args.url
+    server_pid = args.server_pid
+    server = None
+    if args.in_process:
+        port = _free_port()
+        server, _ = start_in_process_server(port)
+        ws_url = f"ws://127.0.0.1:{port}"
+        # Clients share this process, so CPU figures include client work
+        server_pid = os.getpid()
+        logger.info(f"Started in-process server on port {port}")
+
+    if args.race:
+        race_data = fetch_race_data(ws_url.replace("ws", "http", 1), args.race)
+    else:
+        race_data = synthetic_race_data(args.frames, args.drivers)
+
+    steps = []
+    for speed in [float(s) for s in args.speeds.split(',')]:
+        saturation = None
+        for num_clients in [int(c) for c in args.clients.split(',')]:
+            logger.info(f"Running {num_clients} clients at {speed}x for {args.duration:.0f}s")
+            step = asyncio.run(run_step(
+                ws_url, num_clients, race_data, speed, args.encoding, args.duration, args.warmup, server_pid
+            ))
+            step['playback_speed'] = speed
+            steps.append(step)
+
+            print(
+                f"{speed:>5}x {num_clients:>5} clients | "
+                f"{step['frames_per_sec']:8.1f}/{step['intended_frames_per_sec']:.0f} fps | "
+                f"late p50/p95/p99 {step['lateness_p50_ms']:.0f}/{step['lateness_p95_ms']:.0f}/"
+                f"{step['lateness_p99_ms']:.0f} ms | "
+                f"cpu {_format(step.get('cpu_percent_mean'))}% | "
+                f"rss {_format(step.get('rss_mb_max'))} MB | "
+                f"throttled {step['throttled_clients']}"
+                f"{' | SATURATED' if step['saturated'] else ''}"
+            )
+
+            if step['saturated']:
+                saturation = num_clients
+                break
+
+        if saturation is None:
+            print(f"{speed}x: not saturated up to {args.clients.split(',')[-1]} clients")
+        else:
+            print(f"{speed}x: saturated at {saturation} clients")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(steps, f, indent=2)
+
+    if server is not None:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
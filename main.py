@@ -2,12 +2,13 @@
 
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+import argparse
 import uvicorn
 import logging
 
-from backend.api.routes import router
+from backend.api.routes import router, start_preload
 from backend.api.websocket import websocket_endpoint
-from backend.utils.constants import HOST, PORT, APP_NAME, APP_VERSION
+from backend.utils.constants import HOST, PORT, WORKERS, APP_NAME, APP_VERSION
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +37,12 @@ app.add_middleware(
 app.include_router(router)
 
 
+@app.on_event("startup")
+async def preload_warm_races():
+    """Start loading the configured warm races in the background."""
+    start_preload()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -54,14 +61,38 @@ async def websocket_replay(websocket: WebSocket, client_id: str):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"Run the {APP_NAME} server")
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        help="Run without auto-reload, using multiple worker processes"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help="Number of worker processes in production mode"
+    )
+    args = parser.parse_args()
+    
     logger.info(f"Starting {APP_NAME} v{APP_VERSION}")
     logger.info(f"Server running on http://{HOST}:{PORT}")
     logger.info(f"API documentation available at http://{HOST}:{PORT}/docs")
     
-    uvicorn.run(
-        "main:app",
-        host=HOST,
-        port=PORT,
-        reload=True,
-        log_level="info"
-    )
+    if args.production:
+        logger.info(f"Production mode with {args.workers} workers")
+        uvicorn.run(
+            "main:app",
+            host=HOST,
+            port=PORT,
+            workers=args.workers,
+            log_level="info"
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host=HOST,
+            port=PORT,
+            reload=True,
+            log_level="info"
+        )